@@ -1,5 +1,6 @@
 import { Client } from '@modelcontextprotocol/sdk/client/index.js';
 import { StdioClientTransport } from '@modelcontextprotocol/sdk/client/stdio.js';
+import { ResourceUpdatedNotificationSchema } from '@modelcontextprotocol/sdk/types.js';
 import { join } from 'path';
 import { readFileSync, existsSync } from 'fs';
 import { createLogger } from './logger.js';
@@ -30,6 +31,7 @@ class ServerConnection {
     this.healthCheckTimer = null;
     this.closing = false;
     this.offlineUntil = 0;
+    this.resourceListeners = new Map(); // uri → Set<callback>, re-subscribed on reconnect
   }
 
   async connect() {
@@ -77,6 +79,18 @@ class ServerConnection {
       await this.client.connect(this.transport);
       this.connected = true;
 
+      this.client.setNotificationHandler(ResourceUpdatedNotificationSchema, (notification) => {
+        const uri = notification.params?.uri;
+        for (const cb of this.resourceListeners.get(uri) || []) {
+          try { cb(uri); } catch (err) { log.warn({ server: this.name, uri, err: err.message }, 'Resource listener failed'); }
+        }
+      });
+      for (const uri of this.resourceListeners.keys()) {
+        try { await this.client.subscribeResource({ uri }); } catch (err) {
+          log.warn({ server: this.name, uri, err: err.message }, 'Resource re-subscribe failed');
+        }
+      }
+
       // Route stderr through logger
       const stderrStream = this.transport.stderr;
       if (stderrStream) {
@@ -160,6 +174,30 @@ class ServerConnection {
     }
   }
 
+  async readResource(uri, timeout = TOOL_TIMEOUT) {
+    await this.ensureConnected();
+    const start = Date.now();
+    const result = await Promise.race([
+      this.client.readResource({ uri }),
+      new Promise((_, reject) =>
+        setTimeout(() => reject(new Error(`${this.name} ${uri} timeout (${timeout}ms)`)), timeout),
+      ),
+    ]);
+    const text = (result?.contents || []).map(c => c.text || '').join('\n');
+    log.debug({ server: this.name, uri, latencyMs: Date.now() - start, resultLen: text.length }, 'MCP_READ OK');
+    return text;
+  }
+
+  async subscribeResource(uri, onUpdate) {
+    await this.ensureConnected();
+    if (!this.resourceListeners.has(uri)) {
+      await this.client.subscribeResource({ uri });
+      this.resourceListeners.set(uri, new Set());
+    }
+    this.resourceListeners.get(uri).add(onUpdate);
+    return () => this.resourceListeners.get(uri)?.delete(onUpdate);
+  }
+
   startHealthCheck(toolName = 'health_check') {
     if (this.healthCheckTimer) return;
     this.healthCheckTimer = setInterval(async () => {
@@ -251,6 +289,21 @@ export async function callTool(serverName, toolName, args = {}, timeout = TOOL_T
   return getServer(serverName).callTool(toolName, args, timeout);
 }
 
+// ── Resources ───────────────────────────────────────────────────────────────
+
+/** Read a resource (e.g. 'hattrick://players') as text — no tool call involved. */
+export async function readResource(serverName, uri, timeout = TOOL_TIMEOUT) {
+  return getServer(serverName).readResource(uri, timeout);
+}
+
+/**
+ * Call onUpdate(uri) whenever the server reports the resource changed.
+ * Returns an unsubscribe function (the server-side subscription stays until close).
+ */
+export async function subscribeResource(serverName, uri, onUpdate) {
+  return getServer(serverName).subscribeResource(uri, onUpdate);
+}
+
 // ── Lifecycle ───────────────────────────────────────────────────────────────
 
 export async function init() {
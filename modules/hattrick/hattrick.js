@@ -7,12 +7,13 @@
  * Team ID must be set via HATTRICK_TEAM_ID env var.
  */
 
-import { readFileSync, writeFileSync, appendFileSync, existsSync, mkdirSync } from 'fs';
+import { readFileSync, writeFileSync, appendFileSync, existsSync, mkdirSync, statSync } from 'fs';
 import { join } from 'path';
 import config from '../../lib/config.js';
 import { createLogger } from '../../lib/logger.js';
 import { getState, setState } from '../../lib/state.js';
 import { addEntry as addLearningEntry } from '../../lib/learning-journal.js';
+import { getLatestPage, getPageFact } from './page-store.js';
 
 const log = createLogger('hattrick');
 
@@ -177,16 +178,21 @@ export function loadSnapshot() {
 }
 
 /**
- * True if no snapshot exists or it's older than maxAgeMs (default: 7 days).
- * Used by detectHattrickSignals to decide when to re-scrape.
+ * True if the snapshot is missing or older than maxAgeMs (default: 7 days).
+ * Used by detectHattrickSignals on every tick, so it only stat()s the snapshot
+ * (saveSnapshot writes the file at savedAt) — no JSON parsing. The MCP server's
+ * own page reads don't count: loadSnapshot() consumers need the file rewritten.
  *
  * @param {number} [maxAgeMs] - max age in ms before snapshot is considered stale
  * @returns {boolean}
  */
 export function isSnapshotStale(maxAgeMs = 7 * 24 * 3600_000) {
-  const snap = loadSnapshot();
-  if (!snap?.savedAt) return true;
-  return (Date.now() - snap.savedAt) > maxAgeMs;
+  let savedAt = 0;
+  try {
+    if (existsSync(SNAPSHOT_PATH)) savedAt = statSync(SNAPSHOT_PATH).mtimeMs;
+  } catch {}
+  if (!savedAt) return true;
+  return (Date.now() - savedAt) > maxAgeMs;
 }
 
 /**
@@ -368,16 +374,28 @@ export function loadMatchHistory() {
 }
 
 /**
- * True if snapshot contains a lastMatchDate newer than lastReviewedAt.
+ * Date (ms) of the last played match: parsed from the Matches page by the MCP
+ * server (page store, indexed lookup), falling back to the snapshot's lastMatchDate.
+ *
+ * @returns {number|null}
+ */
+export function getLastMatchDate() {
+  const fromStore = getPageFact('matches', 'last_match_at');
+  if (fromStore) return fromStore;
+  return loadSnapshot()?.lastMatchDate || null;
+}
+
+/**
+ * True if the last played match is newer than lastReviewedAt.
  * Used by detectHattrickSignals to decide when to emit hattrick_post_match_review.
  *
  * @param {number} [lastReviewedAt=0] - timestamp of last review
  * @returns {boolean}
  */
 export function hasUnreviewedMatch(lastReviewedAt = 0) {
-  const snap = loadSnapshot();
-  if (!snap?.lastMatchDate) return false;
-  return snap.lastMatchDate > lastReviewedAt;
+  const lastMatchDate = getLastMatchDate();
+  if (!lastMatchDate) return false;
+  return lastMatchDate > lastReviewedAt;
 }
 
 // ─── Post-match Review ────────────────────────────────────────────────────
@@ -661,16 +679,19 @@ Be concise and actionable — the user reads this on WhatsApp.
 IMPORTANT: Always output your findings in a <wa_message> tag so the user receives the update.
 
 ### MCP Tool Error Handling
-- If an MCP tool returns an error, empty data, or a login/session page, **retry once**.
+- If a reply has "site_down": true, hattrick.org itself is down or too slow — it is NOT a session problem, do not ask for a re-login.
+  With "stale": true the reply still carries the last stored copy: use it and mark the report "Based on cached data from [fetched_at] — hattrick.org unavailable". Without data, report the outage and stop.
+- Otherwise, if an MCP tool returns an error, empty data, or a login/session page, **retry once**.
 - If it fails again, do NOT guess or hallucinate data. Report in <wa_message>: "MCP tool [name] failed: [error]. Browser session may need re-login."
-- If hattrick_get_players returns empty/zero players, session expired. Report: "Hattrick session expired — the user, run hattrick_login."
+- If hattrick_get_players returns empty/zero players (and no "site_down"), session expired. Report: "Hattrick session expired — the user, run hattrick_login."
 - When tools are down, use cached data in this brief (if any) and mark report: "Based on cached data from [date] — live data unavailable."`;
 
 const HT_ERROR_HANDLING = `
 ### MCP Tool Error Handling
-- If an MCP tool returns an error, empty data, or a login/session page, retry once.
+- "site_down": true in a reply = hattrick.org is down or too slow, NOT an expired session. Use the stale copy it returns (if any) and mark the report "PARTIAL — cached data from [fetched_at]"; don't retry or ask for a re-login.
+- Otherwise, if an MCP tool returns an error, empty data, or a login/session page, retry once.
 - If it fails again, report the failure in <wa_message> — do NOT guess or hallucinate.
-- Empty player list = session expired. Report: "Hattrick session expired — the user, run hattrick_login."
+- Empty player list without "site_down" = session expired. Report: "Hattrick session expired — the user, run hattrick_login."
 - If tools are completely down, use any cached data provided above and mark report as "PARTIAL — cached data".`;
 
 export function buildEconomyCheckBrief(signal) {
@@ -679,7 +700,9 @@ export function buildEconomyCheckBrief(signal) {
 ${HT_BASE}
 
 ### Task:
-1. Use get_economy to fetch current financial data
+1. Use get_economy to fetch current financial data. The reply may come from the cache:
+   if it says "revalidating": true and "fetched_at" is more than an hour ago, call
+   hattrick_get_economy again with force=true before reporting numbers
 2. Report: cash balance, weekly income, weekly expenses, net cash flow
 3. Flag any financial concerns (wage bill too high, low cash reserves)
 4. Brief recommendation (1-2 sentences) on financial health
@@ -697,26 +720,62 @@ Snapshot: ${snapAge}
 ${HT_BASE}
 
 ### Task:
-1. Use get_team for overall team info
-2. Use get_players for full squad data
-3. Use get_matches for recent results and upcoming fixtures
-4. Use get_economy for financial overview
-5. Provide a brief team status summary: league position, form, squad health, finances
+1. Call hattrick_refresh with pages "team,players,matches,economy,league" and mode "structured" — one call, the pages load in parallel:
+   - team: overall team info (no parsed record — its page text comes back in full; read league position, spirit and confidence from it)
+   - players: full squad data
+   - matches: recent results and upcoming fixtures
+   - economy: financial overview
+   - league: standings (league history is updated from it automatically)
+2. Provide a brief team status summary: league position, form, squad health, finances
 
 This is a routine data refresh. Summarize the key numbers.
 Call saveAnalysis({ action: 'full_refresh', rawAnalysis: <your summary> }) to persist.`;
 }
 
+/**
+ * Current training as last parsed by the MCP server (page store), or null if the
+ * Training page hasn't been read or couldn't be parsed.
+ *
+ * @returns {{ type: number|null, typeName: string|null, intensity: number|null, staminaShare: number|null, coachLevel: number|null, players: object[], fetchedAt: number }|null}
+ */
+export function getCurrentTraining() {
+  const page = getLatestPage('training');
+  const training = page?.facts?.training;
+  if (training?.type == null && !training?.players?.length) return null;
+  return { ...training, players: training.players || [], fetchedAt: page.fetchedAt };
+}
+
+/**
+ * One-paragraph summary of getCurrentTraining() for briefs, '' if unknown.
+ */
+function formatCurrentTraining(training) {
+  if (!training) return '';
+  const ageH = Math.round((Date.now() - training.fetchedAt) / 3_600_000);
+  const slots = { full: [], partial: [], none: [] };
+  for (const p of training.players) if (slots[p.slot]) slots[p.slot].push(p.name);
+  const lines = [
+    `### Current Training (parsed ${ageH}h ago — no need to call hattrick_get_training unless changing it)`,
+    `- Type: ${training.typeName ?? '?'} (value ${training.type ?? '?'}) | Intensity: ${training.intensity ?? '?'}% | Stamina share: ${training.staminaShare ?? '?'}% | Coach level: ${training.coachLevel ?? '?'}`,
+  ];
+  if (training.players.length) {
+    lines.push(`- Full slots: ${slots.full.join(', ') || 'none'}`);
+    lines.push(`- Partial slots: ${slots.partial.join(', ') || 'none'}`);
+    if (slots.none.length) lines.push(`- Not training: ${slots.none.join(', ')}`);
+  }
+  return lines.join('\n');
+}
+
 export function buildTrainingCheckBrief(signal) {
   const snap = loadSnapshot();
   const history = loadMatchHistory();
   const basePrompt = buildTrainingRecommendationPrompt(snap, history);
+  const currentTraining = formatCurrentTraining(getCurrentTraining());
   const progressReport = getTrainingProgressReport();
-  const progressSection = progressReport ? `\n\n${progressReport}` : '';
+  const progressSection = (currentTraining ? `\n\n${currentTraining}` : '') + (progressReport ? `\n\n${progressReport}` : '');
   const skillSnapshotReminder = `\n\n### Skill Snapshot (IMPORTANT)
 After your analysis, also capture a fresh skill snapshot:
-1. Call hattrick_get_players to fetch the current roster with skill levels.
-2. Call saveSnapshot({ players: <parsed player data>, season: <current season>, week: <current week> }) to persist.
+1. Call hattrick_get_players — its "players" field is already parsed (playerID, age, specialty, TSI, wage, form, stamina, and the seven skills as numbers 0-20). Don't re-read the page text to build it.
+2. Call saveSnapshot({ players: <the "players" field as-is>, season: <current season>, week: <current week> }) to persist.
 This ensures weekly training progress is tracked for Mallet + Kassab scoring skill monitoring.`;
   return `## Hattrick Training Check\n\n${basePrompt}${progressSection}${skillSnapshotReminder}\n\nAfter analysis, call saveTrainingRecommendation({ rawReply: <your analysis>, checkedAt: Date.now() }) to persist.`;
 }
@@ -1140,16 +1199,32 @@ export function buildTrainingProgressBrief(signal) {
     }
     lines.push('');
     lines.push('**Steps**:');
-    lines.push('1. Call hattrick_get_training to verify current training type');
+    const current = getCurrentTraining()?.typeName;
+    lines.push(current
+      ? `1. Current training is ${current} (parsed from the Training page) — call hattrick_get_training only if unsure`
+      : '1. Call hattrick_get_training to verify current training type');
     lines.push(`2. Use hattrick_action to switch training to ${switchBack.nextTraining || 'the recommended type'}`);
     lines.push('3. Update hattrick-training.json with new switchedAt timestamp');
     lines.push('4. Message the user: "Scoring target reached! Switching to [training]."');
     lines.push('5. Mark goal 65108985 as completed');
   } else if (evaluation.status === 'stalled') {
+    // Settings and slots are checked here from the parsed Training page when we have it
+    const training = getCurrentTraining();
     lines.push('### Investigation Required');
+    if (training) {
+      const settingsOk = training.intensity === 100 && training.staminaShare >= 10 && training.staminaShare <= 15;
+      lines.push(`- Settings: intensity ${training.intensity ?? '?'}%, stamina share ${training.staminaShare ?? '?'}% — ${settingsOk ? 'OK' : 'OFF TARGET (want 100% / 10-15%)'}`);
+      for (const name of evaluation.players.map(p => p.name)) {
+        const slot = training.players.find(p => p.name === name);
+        lines.push(`- ${name}: ${slot ? `${slot.slot ?? '?'} slot (${slot.share ?? '?'}%)` : 'not in a trained slot'}`);
+      }
+      lines.push('');
+    }
     lines.push('1. Call hattrick_get_players to get fresh skill data');
     lines.push('2. Verify Mallet + Kassab are playing FW/Forward positions (not midfield/wing)');
-    lines.push('3. Check training intensity is 100% and stamina share is 10-15%');
+    lines.push(training
+      ? '3. If settings are off target above, fix them with hattrick_action on the Training page'
+      : '3. Check training intensity is 100% and stamina share is 10-15%');
     lines.push('4. If positions are wrong, note this for next lineup');
     lines.push('5. Message the user if training appears ineffective');
   } else {
@@ -1171,6 +1246,18 @@ export function buildWeeklyDashboardBrief(signal) {
   return `## Hattrick Weekly Dashboard\n\n${basePrompt}\n\nAfter analysis, call saveWeeklyDashboard({ rawReport: <your report> }) to persist.`;
 }
 
+/**
+ * Last known finances: the MCP server's parsed Finances page (page store) when
+ * it has one, else the 'hattrick-economy' state.
+ *
+ * @returns {{ cash?: number, weeklyIncome?: number, weeklyExpenses?: number, weeklyNetProfit?: number, wageTotal?: number, fetchedAt?: number }}
+ */
+export function getLastKnownEconomy() {
+  const page = getLatestPage('economy');
+  if (page?.facts?.cash != null) return { ...page.facts, fetchedAt: page.fetchedAt };
+  return getState('hattrick-economy') || {};
+}
+
 export function buildAutonomousBidBrief(signal) {
   const snap = loadSnapshot();
   const watchlist = loadTransferWatchlist();
@@ -1180,7 +1267,8 @@ export function buildAutonomousBidBrief(signal) {
   const positionGaps = identifyPositionGaps(players);
 
   // Pre-compute financial limits from last known economy
-  const economy = getState('hattrick-economy') || {};
+  const economy = getLastKnownEconomy();
+  const economyAgeMin = economy.fetchedAt ? Math.round((Date.now() - economy.fetchedAt) / 60_000) : null;
   const cash = economy.cash ?? 3_000_000;
   const weeklyNet = (economy.weeklyIncome ?? 500_000) - (economy.weeklyExpenses ?? 0);
   const maxBid = Math.floor(cash * 0.30);
@@ -1217,12 +1305,14 @@ export function buildAutonomousBidBrief(signal) {
 
   return `## Hattrick Autonomous Bid Check
 
-### 💰 PRE-COMPUTED FINANCIAL LIMITS (from last economy snapshot):
+### 💰 PRE-COMPUTED FINANCIAL LIMITS (${economyAgeMin != null ? `from the finances page read ${economyAgeMin} min ago` : 'from last economy snapshot'}):
 - **Cash on hand:** ${cash.toLocaleString()} NIS
 - **MAX SINGLE BID:** ${effectiveMaxBid.toLocaleString()} NIS (30% of cash, with 300K reserve)
 - **CASH FLOOR:** ${cashFloor.toLocaleString()} NIS (must remain after bid)
 - Any bid above ${effectiveMaxBid.toLocaleString()} NIS will be flagged as a VIOLATION.
-- Refresh cash via hattrick_get_economy first — these are last-known values.
+${economyAgeMin != null && economyAgeMin <= 60
+    ? '- These figures are fresh — no need to re-read the finances page.'
+    : '- These are last-known values: call hattrick_get_economy with mode "structured" and force=true first, and take cash / weeklyNetProfit / wageTotal for buildBidFinancialCheck straight from its "finances" record. If finances.cash is null the page could not be parsed and the reply carries the page text instead — read the figures from that.'}
 
 ### Squad Gaps (code-computed):
 ${gapBlock}
@@ -1626,7 +1716,7 @@ function logBidAudit(event, data) {
  */
 export function validateBidCycleOutput(replyText) {
   const violations = [];
-  const economy = getState('hattrick-economy') || {};
+  const economy = getLastKnownEconomy();
   const cash = economy.cash ?? 3_000_000;
   const maxBid = Math.min(Math.floor(cash * 0.30), cash - 300_000);
 
@@ -1881,13 +1971,14 @@ Today is ${weekLabel}. This runs every Monday. the user reads it on WhatsApp —
 - ${trainingCtx}
 
 ## Your Task
-Fetch fresh data and generate the dashboard:
+Fetch fresh data with ONE call — hattrick_refresh with pages "team,players,matches,economy,training"
+(the server loads them in parallel; don't call the single-page tools afterwards). Then take from its result:
 
-1. Use hattrick_get_team → league position, team spirit, confidence, fans
-2. Use hattrick_get_players → squad health (injuries/suspensions), lowest-skilled positions, top 3 players by TSI
-3. Use hattrick_get_matches → next match date/opponent/venue + last 3 results
-4. Use hattrick_get_economy → cash balance, weekly net profit, wages
-5. Use hattrick_get_training → current training type + stamina share
+1. "team" → league position, team spirit, confidence, fans (from its page text)
+2. "players" → its "players" records for the top 3 by TSI and the lowest-skilled positions; its text for injuries/suspensions
+3. "matches" → its "fixtures" records: next upcoming match (date, opponent, isHome) + last 3 finished results
+4. "economy" → its "finances" record: cash, weeklyNetProfit, wageTotal
+5. "training" → its "training" record: typeName, intensity, staminaShare
 
 ## Dashboard Format (WhatsApp, max 15 lines)
 \`\`\`
@@ -2343,10 +2434,31 @@ export function appendLeagueSnapshot(data) {
   }
 }
 
+let _leagueSyncedVersion = null;
+const LEAGUE_ROW_FIELDS = ['position', 'points', 'round', 'goalDiff'];
+
 /**
- * Load league history.
- * @returns {object[]}
- */
+ * Append the own-team row of the MCP server's parsed league table (page store)
+ * to league history when it differs from the last entry. The page version
+ * hashes the whole Series page, so it changes on things that aren't our row;
+ * it only gates the history read. Cheap enough for every agent-loop tick.
+ *
+ * @returns {boolean} true if a snapshot was appended
+ */
+export function syncLeagueSnapshotFromStore() {
+  const page = getLatestPage('league');
+  const own = page?.facts?.own;
+  if (!own?.position || page.version === _leagueSyncedVersion) return false;
+  _leagueSyncedVersion = page.version;
+  const last = loadLeagueHistory().at(-1);
+  if (last && LEAGUE_ROW_FIELDS.every(f => last[f] === own[f])) return false;
+  appendLeagueSnapshot({
+    position: own.position, totalTeams: own.totalTeams, points: own.points,
+    round: own.round, goalDiff: own.goalDiff,
+  });
+  return true;
+}
+
 export function loadLeagueHistory() {
   try {
     if (!existsSync(LEAGUE_HISTORY_PATH)) return [];
@@ -2403,9 +2515,10 @@ export const HATTRICK_MCP_TOOLS = [
   { name: 'hattrick_get_team',     available: true,  description: 'Team overview: name, league position, form, cash balance' },
   { name: 'hattrick_get_players',  available: true,  description: 'Full squad list with skills, ratings, TSI, wages, ages' },
   { name: 'hattrick_get_matches',  available: true,  description: 'Upcoming fixtures and recent match results' },
-  { name: 'hattrick_get_training', available: true,  description: 'Current training type, intensity, stamina share' },
+  { name: 'hattrick_get_training', available: true,  description: 'Current training, parsed: type (dropdown value + name), intensity, stamina share, coach level, per-player slots (full/partial/none)' },
   { name: 'hattrick_get_economy',  available: true,  description: 'Finances: cash, weekly income, expenses, net weekly profit' },
-  { name: 'hattrick_get_league',   available: true,  description: 'League table standings — available but not yet auto-called' },
+  { name: 'hattrick_get_league',   available: true,  description: 'League table, parsed: standings (position, TeamID, W/D/L, goals, points) + own row; part of every full refresh, feeds league history automatically' },
+  { name: 'hattrick_refresh',      available: true,  description: 'Batch read of several get_* pages in parallel tabs (team, players, matches, training, economy, league)' },
   { name: 'transfer_search',       available: false, paywallBlocked: true, workaround: '/World/Transfers/TransfersSearchResult.aspx?showTransfersFromSimilarTeams=1', description: 'SearchPlayers requires Supporter subscription — workaround URL exists' },
   { name: 'doctor_page',           available: false, paywallBlocked: true, description: 'Player injury/fitness data — Supporter-only, AccessDenied' },
 ];
@@ -2670,7 +2783,7 @@ ${matchSummary}
 - Next match: Round 12, Feb 28 (HOME) vs Macabee Tel Aviv
 
 ## Your Task
-1. Use hattrick_get_training to fetch current training type, intensity, and stamina share.
+1. Use hattrick_get_training (mode "structured") — its "training" field has type, intensity, stamina share and which players occupy trained slots.
 2. Use hattrick_get_players to identify which positions have the weakest skill levels.
 3. Analyze: does current training target the weakest area? If not, why not?
 4. Identify the 2-3 players who would benefit MOST from a training switch.
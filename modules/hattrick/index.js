@@ -13,13 +13,15 @@ import {
   buildSquadCleanupBrief, buildBidResolveBrief,
   buildWeeklyPlan, loadSnapshot,
 } from './hattrick.js';
+import { getPageFact } from './page-store.js';
 import { handleGetHattrick, handleCycle, handleRefresh } from './routes.js';
 import { HATTRICK_HTML } from './dashboard.js';
 
 function hasUrgentWork() {
   try {
-    const snap = loadSnapshot();
-    return snap?.nextMatchAt && (snap.nextMatchAt - Date.now()) < 3 * 3600_000;
+    // Fixture parsed by the MCP server first; the snapshot only if the store has none
+    const nextMatchAt = getPageFact('matches', 'next_match_at') || loadSnapshot()?.nextMatchAt;
+    return nextMatchAt && (nextMatchAt - Date.now()) < 3 * 3600_000;
   } catch { return false; }
 }
 
@@ -0,0 +1,88 @@
+/**
+ * modules/hattrick/page-store.js — Read-only view of the hattrick MCP server's page store.
+ *
+ * skills/hattrick-mcp.py records every page it reads in data/hattrick-browser/pages.db
+ * (SQLite, WAL) and keeps one `latest` row per team page — team, players, matches,
+ * training, economy, league — with its fetch time, content version and parsed facts.
+ * Signal detectors query those rows instead of loading whole JSON snapshots each tick.
+ */
+
+import { createRequire } from 'module';
+import { existsSync } from 'fs';
+import { join } from 'path';
+import config from '../../lib/config.js';
+import { createLogger } from '../../lib/logger.js';
+
+const require = createRequire(import.meta.url);
+const Database = require('better-sqlite3');
+
+const log = createLogger('hattrick-page-store');
+const PAGE_STORE_PATH = join(config.dataDir, 'hattrick-browser', 'pages.db');
+
+let _stmts = null;
+
+// Opened lazily and only once the MCP server has created the store; until then
+// every read returns null and is retried on the next call.
+function statements() {
+  if (_stmts) return _stmts;
+  if (!existsSync(PAGE_STORE_PATH)) return null;
+  let db = null;
+  try {
+    db = new Database(PAGE_STORE_PATH, { readonly: true, fileMustExist: true });
+    _stmts = {
+      latest: db.prepare('SELECT page, url, fetched_at, version, changed_at, facts FROM latest WHERE page = ?'),
+      fact: db.prepare('SELECT json_extract(facts, ?) AS value FROM latest WHERE page = ?'),
+    };
+    return _stmts;
+  } catch (err) {
+    log.debug({ err: err.message }, 'Page store not readable yet');
+    try { db?.close(); } catch {}
+    return null;
+  }
+}
+
+/**
+ * Latest read of a team page, or null if the server hasn't read it (or no store exists).
+ *
+ * @param {string} page - team | players | matches | training | economy | league
+ * @returns {{ page: string, url: string, fetchedAt: number, version: string, changedAt: number, facts: object }|null}
+ */
+export function getLatestPage(page) {
+  const stmts = statements();
+  if (!stmts) return null;
+  try {
+    const row = stmts.latest.get(page);
+    if (!row) return null;
+    return {
+      page: row.page,
+      url: row.url,
+      fetchedAt: Math.round(row.fetched_at * 1000),
+      version: row.version,
+      changedAt: Math.round(row.changed_at * 1000),
+      facts: JSON.parse(row.facts || '{}'),
+    };
+  } catch (err) {
+    log.warn({ err: err.message, page }, 'Page store read failed');
+    return null;
+  }
+}
+
+/**
+ * One top-level parsed fact of a team page, e.g. getPageFact('matches', 'last_match_at').
+ * Extracted inside SQLite, so large fact lists are never parsed in JS.
+ *
+ * @param {string} page
+ * @param {string} key
+ * @returns {*} the value, or null when unknown
+ */
+export function getPageFact(page, key) {
+  const stmts = statements();
+  if (!stmts) return null;
+  try {
+    const row = stmts.fact.get(`$.${key}`, page);
+    return row?.value ?? null;
+  } catch (err) {
+    log.warn({ err: err.message, page, key }, 'Page store read failed');
+    return null;
+  }
+}
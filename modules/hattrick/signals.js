@@ -4,7 +4,7 @@
  * Extracted from lib/agent-signals.js. Runs zero-cost (no LLM) every cycle.
  */
 
-import { isConfigured as hattrickConfigured, getTeamId as hattrickTeamId, isSnapshotStale, getScrapeRequest, hasUnreviewedMatch, loadSnapshot as loadHattrickSnapshot, loadTransferWatchlist, loadActiveBids, identifySquadDeadweight } from './hattrick.js';
+import { isConfigured as hattrickConfigured, getTeamId as hattrickTeamId, getPreMatchScrapeUrls, isSnapshotStale, getScrapeRequest, hasUnreviewedMatch, getLastMatchDate, syncLeagueSnapshotFromStore, loadSnapshot as loadHattrickSnapshot, loadTransferWatchlist, loadActiveBids, identifySquadDeadweight } from './hattrick.js';
 import { getState } from '../../lib/state.js';
 import config from '../../lib/config.js';
 import { createLogger } from '../../lib/logger.js';
@@ -37,15 +37,17 @@ export function detectHattrickSignals(state) {
       }
     } else {
       const teamId = hattrickTeamId();
-      const scrapeUrls = [
-        `https://www.hattrick.org/en/Club/?TeamID=${teamId}`,
-        `https://www.hattrick.org/en/Club/Matches/?TeamID=${teamId}`,
-        `https://www.hattrick.org/en/Club/Players/?TeamID=${teamId}`,
-      ];
+      // Same builders as the rest of the module so URLs match the MCP server's cache keys
+      const scrapeUrls = getPreMatchScrapeUrls(teamId);
 
       // Read hattrick-cycle state for timestamps (authoritative source)
       const htState = getState('hattrick-cycle') || {};
 
+      // League trend data comes straight from the last parsed league table
+      try { syncLeagueSnapshotFromStore(); } catch (err) {
+        log.warn({ err: err.message }, 'League snapshot sync failed');
+      }
+
       // Check if weekly cron has scheduled a scrape (high urgency)
       const cronRequest = getScrapeRequest();
       if (cronRequest && cronRequest > (htState.lastMatchPrepAt || 0)) {
@@ -75,7 +77,7 @@ export function detectHattrickSignals(state) {
           summary: `Hattrick post-match review pending — Round ${snap?.lastMatchRound || '?'} result not yet reviewed`,
           data: {
             teamId,
-            lastMatchDate: snap?.lastMatchDate,
+            lastMatchDate: getLastMatchDate(),
             round: snap?.lastMatchRound,
           },
         });
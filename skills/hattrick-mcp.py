@@ -1,8 +1,9 @@
 """
 Hattrick MCP Server — full browser automation for hattrick.org.
 
-Uses scrapling's StealthyFetcher (anti-bot detection).
-Every call: open browser → login if needed → navigate → extract/act.
+Uses the same stealth Firefox (Camoufox) that scrapling's StealthyFetcher drives,
+but keeps one browser + context warm for the lifetime of the server process.
+Every call: open tab → login if needed → navigate → extract/act.
 
 Key tools:
   - hattrick_inspect: discover interactive elements (buttons, inputs, selects, forms)
@@ -15,9 +16,23 @@ The bot workflow: scrape → inspect → action → verify.
 Run: python skills/hattrick-mcp.py
 """
 
+import asyncio
+import difflib
+import hashlib
 import json
+import logging
 import os
 import re
+import sqlite3
+import tempfile
+import threading
+import time
+import zlib
+from collections import Counter, deque
+from contextlib import asynccontextmanager
+from datetime import datetime
+from html.parser import HTMLParser
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
 
 from mcp.server.fastmcp import FastMCP
 
@@ -31,6 +46,43 @@ TEAM_ID = os.environ.get("HATTRICK_TEAM_ID", "")
 LEAGUE_ID = os.environ.get("HATTRICK_LEAGUE_ID", "")
 BASE = "https://www.hattrick.org"
 TIMEOUT = 60_000
+MAX_TABS = max(1, int(os.environ.get("HATTRICK_MAX_TABS", "4")))  # concurrent pages in the shared context
+HTTP_READS = os.environ.get("HATTRICK_HTTP_READS", "1") != "0"  # browser-free reads with saved cookies
+HTTP_TIMEOUT = 15.0
+KEEPALIVE_S = int(os.environ.get("HATTRICK_KEEPALIVE_S", "600"))  # background session check interval, 0 = off
+PREFETCH_LEAD_S = int(os.environ.get("HATTRICK_PREFETCH_LEAD_S", "300"))  # warm pages this long before a cron, 0 = off
+DEFAULT_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:135.0) Gecko/20100101 Firefox/135.0"
+
+
+def _env_set(name: str, default: str) -> set:
+    """Comma-separated env var → lowercase set (empty string disables the default)."""
+    return {v.strip().lower() for v in os.environ.get(name, default).split(",") if v.strip()}
+
+
+# Request blocking — the scraper only reads text, links and tables, so images,
+# fonts, media, ads and trackers are pure overhead. Hosts match on suffix.
+BLOCK_RESOURCE_TYPES = _env_set("HATTRICK_BLOCK_TYPES", "image,media,font")
+BLOCK_HOSTS = _env_set("HATTRICK_BLOCK_HOSTS", ",".join([
+    "doubleclick.net", "googlesyndication.com", "googleadservices.com", "adservice.google.com",
+    "google-analytics.com", "googletagmanager.com", "googletagservices.com", "adnxs.com",
+    "criteo.com", "criteo.net", "amazon-adsystem.com", "scorecardresearch.com", "quantserve.com",
+    "facebook.net", "connect.facebook.net", "hotjar.com", "taboola.com", "outbrain.com",
+    "pubmatic.com", "rubiconproject.com", "openx.net", "moatads.com", "cookielaw.org",
+]))
+ALLOW_HOSTS = _env_set("HATTRICK_ALLOW_HOSTS", "")
+# Routed requests skip the browser's HTTP cache, so only URLs that may be blocked
+# are routed at all: blocked hosts, plus these file types for the blocked resource types
+_TYPE_EXTENSIONS = {
+    "image": ("png", "jpg", "jpeg", "gif", "webp", "svg", "ico", "avif", "bmp"),
+    "media": ("mp4", "webm", "mp3", "ogg", "wav", "m4a"),
+    "font": ("woff", "woff2", "ttf", "otf", "eot"),
+}
+BLOCK_EXTENSIONS = {ext for t in BLOCK_RESOURCE_TYPES for ext in _TYPE_EXTENSIONS.get(t, ())}
+
+# Counters surfaced by hattrick_stats
+_stats = Counter()
+
+log = logging.getLogger("hattrick-mcp")
 
 # SSL certs for Windows
 CA_BUNDLE = os.path.join(os.path.expanduser("~"), ".ssl", "cacert.pem")
@@ -38,69 +90,633 @@ if os.path.exists(CA_BUNDLE):
     os.environ["SSL_CERT_FILE"] = CA_BUNDLE
     os.environ["CURL_CA_BUNDLE"] = CA_BUNDLE
 
-mcp = FastMCP("hattrick")
+
+@asynccontextmanager
+async def _lifespan(_server):
+    """Start background upkeep; close the shared browser when the MCP server shuts down."""
+    tasks = []
+    if KEEPALIVE_S > 0 and HATTRICK_USERNAME and HATTRICK_PASSWORD:
+        tasks.append(asyncio.create_task(_keepalive_loop()))
+    if PREFETCH_LEAD_S > 0 and HATTRICK_USERNAME and HATTRICK_PASSWORD:
+        tasks.append(asyncio.create_task(_prefetch_loop()))
+    try:
+        yield
+    finally:
+        for t in tasks:
+            t.cancel()
+        await _browser.close()
+        await _close_http()
+
+
+mcp = FastMCP("hattrick", lifespan=_lifespan)
 
 # --- Session persistence (cookies + authenticated subdomain) ---
-_session_file = os.path.join(DATA_DIR, "session.json")
+SESSION_TRUST_S = 60  # a session validated this recently skips the "still logged in?" probe
+
+
+class _SessionStore:
+    """session.json held in memory: loaded once, reloaded only when the file's mtime changes.
+
+    Shape: {cookies: [...], auth_base: "https://www84.hattrick.org", user_agent: "...",
+            logged_in_at: epoch, validated_at: epoch, lifetimes: [seconds, ...]}
+
+    Writes are write-behind: update() changes memory immediately and a background
+    task persists it (temp file + rename, off the event loop), so a crash mid-write
+    can't leave a truncated file behind.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._data = {}
+        self._mtime = None
+        self._dirty = False
+        self._flush_task = None
 
+    def get(self) -> dict:
+        if not self._dirty:
+            try:
+                mtime = os.stat(self.path).st_mtime_ns
+            except FileNotFoundError:
+                mtime = None
+            if mtime != self._mtime:
+                self._data = self._read() if mtime is not None else {}
+                self._mtime = mtime
+        return self._data
+
+    def update(self, **fields):
+        self._data = {**self.get(), **fields}
+        self._dirty = True
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._write(dict(self._data))  # no loop (startup/tests) — write inline
+            self._dirty = False
+            return
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = loop.create_task(self._flush())
+
+    def save_login(self, cookies: list, auth_base: str, user_agent: str = ""):
+        """Record a fresh session (user_agent lets HTTP reads look like the browser)."""
+        now = time.time()
+        self.update(cookies=cookies, auth_base=auth_base,
+                    user_agent=user_agent or self.get().get("user_agent", ""),
+                    logged_in_at=now, validated_at=now)
+
+    def mark_validated(self):
+        """Note that the session was just seen working. Memory only — not worth a disk write."""
+        if self.get():
+            self._data["validated_at"] = time.time()
+
+    def invalidate(self):
+        """The session was seen logged out — learn how long it lasted, then forget it was valid."""
+        data = self.get()
+        if data.get("validated_at") and data.get("logged_in_at"):
+            # validated_at is the last moment it was known good: a conservative lifetime
+            lived = data["validated_at"] - data["logged_in_at"]
+            self.update(lifetimes=(data.get("lifetimes") or [])[-9:] + [round(lived)], validated_at=0)
+        else:
+            data.pop("validated_at", None)
+
+    def expected_lifetime(self):
+        """Median observed session lifetime in seconds, None until an expiry has been seen."""
+        lifetimes = sorted(v for v in self.get().get("lifetimes") or [] if v > 0)
+        return lifetimes[len(lifetimes) // 2] if lifetimes else None
+
+    def validated_within(self, seconds: float) -> bool:
+        return time.time() - self.get().get("validated_at", 0) < seconds
+
+    def age(self) -> float:
+        """Seconds since the last login (0 if unknown)."""
+        logged_in_at = self.get().get("logged_in_at")
+        return time.time() - logged_in_at if logged_in_at else 0.0
+
+    async def _flush(self):
+        while self._dirty:
+            self._dirty = False
+            await asyncio.to_thread(self._write, dict(self._data))
+
+    def _read(self) -> dict:
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)
+        except Exception as e:
+            log.warning("session file unreadable, starting without a session: %s", e)
+            return {}
+
+    def _write(self, data: dict):
+        try:
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(self.path), prefix=".session-", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w") as f:
+                    json.dump(data, f)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp, self.path)
+            except BaseException:
+                try:
+                    os.unlink(tmp)
+                except OSError:
+                    pass
+                raise
+            self._mtime = os.stat(self.path).st_mtime_ns
+        except Exception as e:
+            log.warning("failed to persist session: %s", e)
+
+
+_sessions = _SessionStore(os.path.join(DATA_DIR, "session.json"))
+
+
+# ---------------------------------------------------------------------------
+# URLs
+# ---------------------------------------------------------------------------
 
-def _load_session() -> dict:
-    """Load saved session: {cookies: [...], auth_base: "https://www84.hattrick.org"}"""
+_HT_HOST = re.compile(r"^(?:www\d*\.)?hattrick\.org$", re.IGNORECASE)
+_LOCALE_PREFIX = re.compile(r"^/([a-z]{2}(?:-[a-z]{2})?)(?=/|$)", re.IGNORECASE)
+
+
+def _is_hattrick(parts) -> bool:
+    return not parts.netloc or bool(_HT_HOST.match(parts.hostname or ""))
+
+
+def _canonical(url: str) -> str:
+    """One key for every spelling of the same hattrick page.
+
+    Host-independent (www / wwwNN / bare path), locale prefix lowercased and
+    defaulted to /en, path lowercased with Default.aspx and trailing slashes
+    normalised, query keys lowercased (TeamID == teamId), empty values dropped,
+    pairs sorted, fragment dropped. Non-hattrick URLs come back unchanged.
+    """
+    parts = urlsplit(url.strip())
+    if not _is_hattrick(parts):
+        return url
+    path = parts.path or "/"
+    m = _LOCALE_PREFIX.match(path)
+    locale = m.group(1).lower() if m else "en"
+    rest = (path[m.end():] if m else path).lower() or "/"
+    rest = re.sub(r"/default\.aspx$", "/", rest)
+    if not re.search(r"\.as[hp]x$", rest) and not rest.endswith("/"):
+        rest += "/"
+    query = sorted((k.lower(), v) for k, v in parse_qsl(parts.query) if v != "")
+    return f"/{locale}{rest}" + (f"?{urlencode(query)}" if query else "")
+
+
+def _origin(url: str) -> str:
+    """scheme://host of a URL (e.g. the authenticated https://www84.hattrick.org)."""
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}" if parts.netloc else BASE
+
+
+def _to_base(url: str, base: str) -> str:
+    """Point any hattrick URL (www, another wwwNN, or a bare path) at the given host."""
+    parts = urlsplit(url)
+    if not _is_hattrick(parts):
+        return url
+    target = urlsplit(base)
+    return urlunsplit((target.scheme, target.netloc, parts.path or "/", parts.query, parts.fragment))
+
+
+# ---------------------------------------------------------------------------
+# Persistent browser
+# ---------------------------------------------------------------------------
+
+def _host_in(host: str, hosts: set) -> bool:
+    return any(host == h or host.endswith("." + h) for h in hosts)
+
+
+def _should_block(resource_type: str, url: str) -> str:
+    """Return why a request should be blocked ("type"/"host"), or "" to let it through."""
+    host = (urlsplit(url).hostname or "").lower()
+    if _host_in(host, ALLOW_HOSTS):
+        return ""
+    if _host_in(host, BLOCK_HOSTS):
+        return "host"
+    if resource_type in BLOCK_RESOURCE_TYPES:
+        return "type"
+    return ""
+
+
+def _may_block(url: str) -> bool:
+    """Route matcher: could the policy block this URL? Everything else stays unrouted (and cacheable)."""
+    parts = urlsplit(url)
+    host = (parts.hostname or "").lower()
+    if _host_in(host, ALLOW_HOSTS):
+        return False
+    if _host_in(host, BLOCK_HOSTS):
+        return True
+    name = parts.path.rsplit("/", 1)[-1]
+    return "." in name and name.rsplit(".", 1)[1].lower() in BLOCK_EXTENSIONS
+
+
+async def _route_request(route):
+    """Handler for the URLs _may_block matched: abort what the policy blocks, count it, pass the rest."""
+    req = route.request
+    reason = _should_block(req.resource_type, req.url)
     try:
-        with open(_session_file, "r") as f:
-            return json.load(f)
+        if reason:
+            _stats["requests_blocked"] += 1
+            _stats[f"blocked_{reason}:{req.resource_type}"] += 1
+            await route.abort()
+        else:
+            await route.continue_()
     except Exception:
-        return {}
+        pass  # page navigated away / closed while the request was in flight
+
+
+def _count_request(request):
+    _stats["requests_seen"] += 1
 
 
-def _save_session(cookies: list, auth_base: str):
-    """Save session for reuse on next call."""
+class _Browser:
+    """One long-lived stealth browser context shared by every tool call.
+
+    Launched lazily on first use and relaunched if the browser process dies,
+    so a warm call costs one navigation instead of a full browser launch.
+    Tabs are pooled inside the one authenticated context; a semaphore caps how
+    many calls drive a tab at the same time (HATTRICK_MAX_TABS).
+
+    `launches` doubles as the context's generation: a tab that fails because the
+    browser died recycles only the generation it ran on, so concurrent failures
+    don't tear down a browser another call has just relaunched.
+    """
+
+    def __init__(self, max_tabs: int = MAX_TABS):
+        self._playwright = None
+        self._context = None
+        self._lock = asyncio.Lock()
+        self._slots = asyncio.Semaphore(max_tabs)
+        self._idle = []  # open pages waiting for reuse
+        self._busy = 0
+        self.max_tabs = max_tabs
+        self.launches = 0
+
+    @property
+    def alive(self) -> bool:
+        return self._context is not None
+
+    async def context(self):
+        """Return the shared context, launching (or relaunching) it if needed."""
+        async with self._lock:
+            if self._context is None:
+                if self._playwright is not None:
+                    await self._shutdown()  # context closed underneath us — stop its driver too
+                await self._launch()
+            return self._context
+
+    async def _launch(self):
+        from camoufox.async_api import AsyncNewBrowser
+        from playwright.async_api import async_playwright
+
+        self._playwright = await async_playwright().start()
+        try:
+            self._context = await AsyncNewBrowser(
+                self._playwright,
+                headless=True,
+                persistent_context=True,
+                user_data_dir=DATA_DIR,
+            )
+        except Exception:
+            await self._playwright.stop()
+            self._playwright = None
+            raise
+        self._context.set_default_timeout(TIMEOUT)
+        self._context.on("close", lambda _ctx: self._forget())
+        self._context.on("request", _count_request)
+        await self._context.route(_may_block, _route_request)
+        # A persistent context starts with one blank tab — put it in the pool
+        self._idle = list(self._context.pages)
+        self.launches += 1
+
+    def _forget(self):
+        """Drop references to a context that closed underneath us (crash, kill)."""
+        self._context = None
+        self._idle = []
+
+    @asynccontextmanager
+    async def tab(self):
+        """Borrow a page from the pool, waiting for a free slot if all are busy.
+
+        If the body fails because the browser died, the browser is recycled
+        (once per generation) before the error propagates; callers may retry.
+        """
+        async with self._slots:
+            ctx = await self.context()
+            generation = self.launches
+            page = None
+            reusable = False
+            self._busy += 1
+            try:
+                while self._idle and page is None:
+                    candidate = self._idle.pop()
+                    if not candidate.is_closed():
+                        page = candidate
+                if page is None:
+                    page = await ctx.new_page()
+                yield page
+                reusable = True
+            except Exception as e:
+                if _is_browser_dead(e):
+                    await self.recycle(generation)
+                raise
+            finally:
+                self._busy -= 1
+                if reusable and self._context is ctx and not page.is_closed():
+                    self._idle.append(page)
+                elif page is not None:
+                    try:
+                        await page.close()
+                    except Exception:
+                        pass
+
+    def pool_stats(self) -> dict:
+        return {
+            "max_tabs": self.max_tabs,
+            "idle_tabs": len(self._idle),
+            "busy_tabs": self._busy,
+            "browser_alive": self.alive,
+            "browser_launches": self.launches,
+        }
+
+    async def recycle(self, generation: int = None):
+        """Tear down the browser; the next call launches a fresh one.
+
+        With a generation, only if that is still the current launch — a later
+        one was started by someone who already recovered.
+        """
+        async with self._lock:
+            if generation is None or generation == self.launches:
+                await self._shutdown()
+
+    async def close(self):
+        async with self._lock:
+            await self._shutdown()
+
+    async def _shutdown(self):
+        ctx, pw = self._context, self._playwright
+        self._context = None
+        self._playwright = None
+        self._idle = []
+        if ctx is not None:
+            try:
+                await ctx.close()
+            except Exception:
+                pass
+        if pw is not None:
+            try:
+                await pw.stop()
+            except Exception:
+                pass
+
+
+_browser = _Browser()
+
+
+def _is_browser_dead(err: Exception) -> bool:
+    """True if an error means the browser/context is gone and must be relaunched."""
+    msg = str(err).lower()
+    return not _browser.alive or any(s in msg for s in (
+        "target closed", "has been closed", "browser closed", "connection closed",
+    ))
+
+
+# ---------------------------------------------------------------------------
+# Page readiness
+# ---------------------------------------------------------------------------
+
+# Page type → what "loaded" means for it. Each entry waits for a selector or a
+# DOM predicate, capped at its timeout; on timeout we extract whatever is there.
+# Checked in order — first path match wins.
+READY_TIMEOUT = 8000
+SETTLE_TIMEOUT = 5000  # after a mutating action: how long to wait for its requests to finish
+_READINESS = [
+    ("MatchOrder", r"/Club/Matches/MatchOrder", {
+        "predicate": "() => document.readyState === 'complete' && !!document.querySelector('select, [class*=\"lineup\" i], [id*=\"lineup\" i]')",
+        "timeout": 15000,
+    }),
+    ("Players", r"/Club/Players", {"selector": "a[href*='PlayerID=' i]"}),
+    ("Matches", r"/Club/Matches", {"selector": "a[href*='matchID=' i]"}),
+    ("Finances", r"/Club/Finances", {"selector": "table"}),
+    ("Training", r"/Club/Training", {"selector": "select, table"}),
+    ("Series", r"/World/Series", {"selector": "table a[href*='TeamID=' i]"}),
+]
+_READY_DEFAULT = {"predicate": "() => !!document.body && document.body.innerText.trim().length > 200"}
+
+
+def _readiness_for(url: str) -> tuple:
+    """Return (page_type, spec) for a URL; unknown pages get the generic main-body wait."""
+    for page_type, pattern, spec in _READINESS:
+        if re.search(pattern, url, re.IGNORECASE):
+            return page_type, spec
+    return "Page", _READY_DEFAULT
+
+
+async def _wait_ready(page, url: str = "") -> bool:
+    """Wait until the page's main content exists instead of sleeping a fixed time.
+
+    Returns False if the cap was hit (the caller still extracts what is there).
+    """
+    _page_type, spec = _readiness_for(url or page.url)
+    timeout = spec.get("timeout", READY_TIMEOUT)
     try:
-        with open(_session_file, "w") as f:
-            json.dump({"cookies": cookies, "auth_base": auth_base}, f)
+        if "predicate" in spec:
+            await page.wait_for_function(spec["predicate"], timeout=timeout)
+        else:
+            await page.wait_for_selector(spec["selector"], state="attached", timeout=timeout)
+        return True
     except Exception:
-        pass
+        return False
+
+
+# ---------------------------------------------------------------------------
+# Extraction
+# ---------------------------------------------------------------------------
+
+# Field projections: what a caller needs back from the page. links/tables are
+# limits (0 = skip). Everything is gathered in one page.evaluate round trip.
+# row_meta: per table row, the hrefs and icon titles/alts in it (tables[i]["meta"])
+# controls: limit on form controls read back with their current values (selects, inputs)
+FIELDS_ALL = {"text": True, "links": 60, "tables": 10}
+FIELDS_TEXT = {"text": True, "links": 0, "tables": 0}
+
+_EXTRACT_JS = """(f) => {
+    const out = {};
+    if (f.text) out.text = document.body ? document.body.innerText : '';
+    if (f.links) {
+        out.links = [];
+        for (const a of document.querySelectorAll('a[href]')) {
+            if (!a.href || a.href.startsWith('javascript:')) continue;
+            const text = (a.innerText || '').trim().substring(0, 80);
+            if (!text) continue;
+            out.links.push({ href: a.href, text });
+            if (out.links.length >= f.links) break;
+        }
+    }
+    if (f.tables) {
+        out.tables = Array.from(document.querySelectorAll('table')).slice(0, f.tables).map(t => {
+            const rows = [], meta = [];
+            for (const tr of t.querySelectorAll('tr')) {
+                const cells = Array.from(tr.querySelectorAll('td, th')).map(c => (c.innerText || '').trim());
+                if (!cells.some(c => c)) continue;
+                rows.push(cells);
+                if (f.row_meta) meta.push({
+                    links: Array.from(tr.querySelectorAll('a[href]')).map(a => a.href).filter(h => !h.startsWith('javascript:')),
+                    icons: Array.from(tr.querySelectorAll('img, [title]'))
+                        .map(el => el.getAttribute('title') || el.getAttribute('alt') || '').filter(Boolean),
+                });
+            }
+            return f.row_meta ? { rows, meta } : { rows };
+        }).filter(t => t.rows.length > 0);
+    }
+    if (f.controls) {
+        out.controls = [];
+        for (const el of document.querySelectorAll('select, input')) {
+            const type = el.tagName === 'SELECT' ? 'select' : (el.type || 'text').toLowerCase();
+            if (['hidden', 'submit', 'button', 'image', 'reset', 'password'].includes(type)) continue;
+            const c = { name: el.name || '', id: el.id || '', type, value: el.value || '' };
+            if (type === 'select') c.label = el.selectedOptions[0] ? el.selectedOptions[0].text.trim() : '';
+            if (type === 'checkbox' || type === 'radio') c.checked = el.checked;
+            out.controls.push(c);
+            if (out.controls.length >= f.controls) break;
+        }
+    }
+    return out;
+}"""
+
+
+def _fields(**overrides) -> dict:
+    """FIELDS_ALL with some limits changed, e.g. _fields(links=0, tables=5)."""
+    return {**FIELDS_ALL, **overrides}
+
+
+async def _extract(page, fields: dict) -> dict:
+    """Read text / links / tables from the current page in a single evaluate."""
+    return await page.evaluate(_EXTRACT_JS, {
+        "text": bool(fields.get("text")),
+        "links": int(fields.get("links") or 0),
+        "tables": int(fields.get("tables") or 0),
+        "row_meta": bool(fields.get("row_meta")),
+        "controls": int(fields.get("controls") or 0),
+    })
 
 
 # ---------------------------------------------------------------------------
 # Core browser engine
 # ---------------------------------------------------------------------------
 
-async def _open_page(target_url: str, page_callback=None, wait_ms: int = 3000) -> dict:
+async def _login(page) -> str:
+    """Run the hattrick.org login form on this tab, save the session, return auth_base.
+
+    If the homepage shows no login form the browser context is still authenticated:
+    its cookies are saved but it doesn't count as a login (logged_in_at is kept).
+    """
+    # Only the login path needs the homepage (that's where the login form lives)
+    await page.goto(f"{BASE}/en/", wait_until="domcontentloaded", timeout=20000)
+    try:
+        await page.wait_for_selector('text=Log In', state="visible", timeout=READY_TIMEOUT)
+    except Exception:
+        pass
+
+    # Click "Log In" to reveal form
+    login_el = page.locator('text=Log In')
+    submitted = await login_el.count() > 0 and await login_el.first.is_visible()
+    if submitted:
+        _stats["logins"] += 1
+        await login_el.first.click()
+        await page.wait_for_selector("#inputLoginname", state="visible", timeout=10000)
+
+        await page.fill("#inputLoginname", HATTRICK_USERNAME)
+        await page.fill("#inputPassword", HATTRICK_PASSWORD)
+
+        submit = page.locator('button.primary-button:has-text("Log In")')
+        await submit.click()
+
+        try:
+            await page.wait_for_url("**/MyHattrick/**", timeout=15000)
+        except Exception:
+            await page.wait_for_load_state("networkidle", timeout=10000)
+
+    # Capture authenticated subdomain (e.g. https://www84.hattrick.org)
+    auth_base = _origin(page.url)
+
+    # Save session for next call
+    cookies = await page.context.cookies()
+    if submitted:
+        _sessions.save_login(cookies, auth_base, await page.evaluate("() => navigator.userAgent"))
+    else:
+        _sessions.update(cookies=cookies, auth_base=auth_base)
+        _sessions.mark_validated()
+    return auth_base
+
+
+_login_lock = asyncio.Lock()
+
+
+async def _login_once(page, seen_login_at: float, fresh: bool = False) -> str:
+    """Single-flight login: only one call runs the login form at a time.
+
+    seen_login_at is the session's logged_in_at when the caller found it expired.
+    If someone else logged in since then, reuse their cookies + auth_base instead
+    of logging in again (parallel logins race on the session and trip anti-bot checks).
+
+    fresh=True forces a real login even though the context may still be
+    authenticated: its cookies are cleared first, so the login form shows up.
     """
-    Open browser → reuse session if possible → login only if expired → navigate → extract.
-    Session (cookies + auth subdomain) persists across calls.
+    async with _login_lock:
+        session = _sessions.get()
+        if session.get("logged_in_at", 0) > seen_login_at and session.get("auth_base"):
+            _stats["logins_avoided"] += 1
+            if session.get("cookies"):
+                await page.context.add_cookies(session["cookies"])
+            return session["auth_base"]
+        if fresh:
+            await page.context.clear_cookies()
+        return await _login(page)
+
+
+async def _open_page(target_url: str, page_callback=None, fields: dict = None) -> dict:
     """
-    from scrapling import StealthyFetcher
+    Open a tab on the shared browser → reuse session if possible → login only if
+    expired → navigate → extract. Session (cookies + auth subdomain) persists across calls.
 
+    fields: projection of what to extract (see FIELDS_ALL); defaults to everything.
+    """
+    fields = FIELDS_ALL if fields is None else fields
     if target_url.startswith("/"):
         target_url = BASE + target_url
 
-    captured = {"text": "", "url": target_url, "links": [], "tables": [], "elements": [], "error": None}
-    session = _load_session()
+    captured = {"text": "", "url": target_url, "links": [], "tables": [], "elements": [], "error": None,
+                "served_by": "browser"}
+    session = _sessions.get()
     saved_cookies = session.get("cookies", [])
     saved_auth_base = session.get("auth_base", "")
+    seen_login_at = session.get("logged_in_at", 0)
 
     async def flow(page):
-        nonlocal saved_auth_base
-
         auth_base = saved_auth_base or BASE
         logged_in = False
-
-        # --- Fast path: try saved session (cookies + known subdomain) ---
-        if saved_cookies and saved_auth_base:
-            try:
+        # Time of the navigation actually served (for the breaker's slow check):
+        # excludes waiting for a tab, launching the browser and logging in
+        nav_started = time.monotonic()
+
+        # --- Fast path: go straight to the target on the saved subdomain ---
+        # No homepage warm-up: the persistent profile (plus saved cookies) is usually
+        # still authenticated, so the first navigation is the one we actually need.
+        try:
+            if saved_cookies:
                 await page.context.add_cookies(saved_cookies)
 
-                # Navigate directly to target on the saved subdomain (skip homepage)
-                fast_target = target_url.replace(BASE, saved_auth_base, 1) if target_url.startswith(BASE) else saved_auth_base + target_url if target_url.startswith("/") else target_url
-                await page.goto(fast_target, wait_until="domcontentloaded", timeout=25000)
-                await page.wait_for_timeout(2000)
-
-                # Check if session is still valid (no login redirect)
-                cur = page.url
-                if "ReturnUrl" not in cur and "Startpage" not in cur:
-                    # Check page has real content (not login page)
+            fast_target = _to_base(target_url, auth_base)
+            nav_started = time.monotonic()
+            await page.goto(fast_target, wait_until="domcontentloaded", timeout=25000)
+            if "ReturnUrl" not in page.url and "Startpage" not in page.url:
+                await _wait_ready(page, fast_target)
+
+            # Check if session is still valid (no login redirect)
+            cur = page.url
+            if "ReturnUrl" not in cur and "Startpage" not in cur:
+                # Check page has real content (not login page) — skipped when the
+                # session was confirmed moments ago
+                has_login = False
+                if not _sessions.validated_within(SESSION_TRUST_S):
                     login_el = page.locator('text=Log In')
                     has_login = await login_el.count() > 0
                     if has_login:
@@ -108,90 +724,933 @@ async def _open_page(target_url: str, page_callback=None, wait_ms: int = 3000) -
                             has_login = await login_el.first.is_visible()
                         except Exception:
                             has_login = False
-                    if not has_login:
-                        logged_in = True
-                        auth_base = saved_auth_base
-            except Exception:
-                pass
+                if not has_login:
+                    logged_in = True
+                    auth_base = _origin(cur)
+                    if auth_base != saved_auth_base:
+                        # First warm call without session.json — remember the subdomain
+                        _sessions.update(cookies=await page.context.cookies(), auth_base=auth_base)
+                    _sessions.mark_validated()
+            if not logged_in:
+                _sessions.invalidate()
+        except Exception:
+            pass
 
         # --- Slow path: fresh login ---
         if not logged_in and HATTRICK_USERNAME and HATTRICK_PASSWORD:
-            # Go to homepage
-            await page.goto(f"{BASE}/en/", wait_until="networkidle", timeout=20000)
-            await page.wait_for_timeout(1500)
-
-            # Click "Log In" to reveal form
-            login_el = page.locator('text=Log In')
-            if await login_el.count() > 0 and await login_el.first.is_visible():
-                await login_el.first.click()
-                await page.wait_for_timeout(2000)
-
-                await page.fill("#inputLoginname", HATTRICK_USERNAME)
-                await page.fill("#inputPassword", HATTRICK_PASSWORD)
-                await page.wait_for_timeout(500)
-
-                submit = page.locator('button.primary-button:has-text("Log In")')
-                await submit.click()
-
-                try:
-                    await page.wait_for_url("**/MyHattrick/**", timeout=15000)
-                except Exception:
-                    await page.wait_for_load_state("networkidle", timeout=10000)
-                await page.wait_for_timeout(2000)
-
-            # Capture authenticated subdomain (e.g. https://www84.hattrick.org)
-            import re as _re
-            m = _re.match(r"(https://[^/]+)", page.url)
-            auth_base = m.group(1) if m else BASE
-
-            # Save session for next call
-            cookies = await page.context.cookies()
-            _save_session(cookies, auth_base)
+            auth_base = await _login_once(page, seen_login_at)
 
             # Navigate to target on the authenticated subdomain
-            actual_target = target_url.replace(BASE, auth_base, 1) if target_url.startswith(BASE) else auth_base + target_url if target_url.startswith("/") else target_url
+            actual_target = _to_base(target_url, auth_base)
+            nav_started = time.monotonic()
             await page.goto(actual_target, wait_until="domcontentloaded", timeout=30000)
-            await page.wait_for_timeout(wait_ms)
+            await _wait_ready(page, actual_target)
 
         # Run callback (actions, inspection, etc.)
         if page_callback:
             await page_callback(page)
 
-        # Extract page data
+        # Extract page data — only the fields this caller asked for
         captured["url"] = page.url
-        captured["text"] = await page.evaluate("() => document.body.innerText")
-
-        captured["links"] = await page.evaluate("""() =>
-            Array.from(document.querySelectorAll('a[href]'))
-                .map(a => ({ href: a.href, text: (a.innerText || '').trim().substring(0, 80) }))
-                .filter(l => l.href && l.text && !l.href.startsWith('javascript:'))
-                .slice(0, 60)
-        """)
-
-        captured["tables"] = await page.evaluate("""() =>
-            Array.from(document.querySelectorAll('table')).slice(0, 10).map(t => ({
-                rows: Array.from(t.querySelectorAll('tr')).map(tr =>
-                    Array.from(tr.querySelectorAll('td, th')).map(c => (c.innerText || '').trim())
-                ).filter(r => r.length > 0 && r.some(c => c))
-            })).filter(t => t.rows.length > 0)
-        """)
+        captured.update(await _extract(page, fields))
+        captured["nav_s"] = time.monotonic() - nav_started
+
+    async def run_on_tab():
+        async with _browser.tab() as page:
+            await flow(page)
 
     try:
-        await StealthyFetcher.async_fetch(
-            f"{BASE}/en/",
-            headless=True,
-            network_idle=True,
-            timeout=TIMEOUT,
-            page_action=flow,
-            user_data_dir=DATA_DIR,
-            wait=1000,
-        )
+        try:
+            await run_on_tab()
+        except Exception as e:
+            if not _is_browser_dead(e):
+                raise
+            # Browser crashed or was killed — the tab recycled it; retry once on a fresh launch
+            await run_on_tab()
     except Exception as e:
         captured["error"] = str(e)
 
     return captured
 
 
+# ---------------------------------------------------------------------------
+# HTTP fast path (no browser)
+# ---------------------------------------------------------------------------
+
+class _HTMLExtractor(HTMLParser):
+    """Server-rendered HTML → the same text / links / tables shape _extract returns.
+
+    Approximates innerText: skips script/style/head and inline-hidden elements,
+    breaks lines at block elements and separates table cells with tabs.
+    """
+
+    _SKIP = {"script", "style", "noscript", "template", "head", "svg"}
+    _VOID = {"br", "img", "input", "meta", "link", "hr", "wbr", "source", "area", "col", "base"}
+    _BLOCK = {"p", "div", "br", "tr", "li", "ul", "ol", "table", "section", "article", "header",
+              "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6", "dd", "dt", "dl", "fieldset", "select"}
+
+    def __init__(self, base_url: str, fields: dict):
+        super().__init__(convert_charrefs=True)
+        self.base_url = base_url
+        self.max_links = int(fields.get("links") or 0)
+        self.max_tables = int(fields.get("tables") or 0)
+        self.row_meta = bool(fields.get("row_meta"))
+        self.max_controls = int(fields.get("controls") or 0)
+        self.chunks = []
+        self.controls = []
+        self.links = []
+        self.tables = []
+        self._skip_tag = None
+        self._skip_depth = 0
+        self._link = None      # [href, text parts] of the <a> being read
+        self._tables = []      # stack of open tables: {"rows": [...], "meta": [...]}
+        self._seen_tables = 0
+        self._cell = None      # text parts of the open td/th
+        self._select = None    # control dict of the open <select>
+        self._option = None    # [value, text parts, selected] of the open <option>
+
+    def handle_starttag(self, tag, attrs):
+        if self._skip_tag:
+            if tag == self._skip_tag:
+                self._skip_depth += 1
+            return
+        a = dict(attrs)
+        style = (a.get("style") or "").replace(" ", "").lower()
+        if tag in self._SKIP or (tag not in self._VOID and ("hidden" in a or "display:none" in style)):
+            self._skip_tag, self._skip_depth = tag, 1
+            return
+        if tag in self._BLOCK:
+            self.chunks.append("\n")
+        row_meta = self._tables[-1]["meta"][-1] if self._tables and self._tables[-1]["meta"] else None
+        if row_meta is not None and (a.get("title") or (tag == "img" and a.get("alt"))):
+            row_meta["icons"].append(a.get("title") or a["alt"])
+        if tag == "a" and a.get("href"):
+            self._link = [urljoin(self.base_url, a["href"]), []]
+            if row_meta is not None and not a["href"].startswith("javascript:"):
+                row_meta["links"].append(self._link[0])
+        elif tag == "table":
+            self._tables.append({"rows": [], "meta": []})
+            self._seen_tables += 1
+            if self._seen_tables <= self.max_tables:
+                self.tables.append(self._tables[-1])
+        elif tag == "tr" and self._tables:
+            self._tables[-1]["rows"].append([])
+            self._tables[-1]["meta"].append({"links": [], "icons": []})
+        elif tag in ("td", "th"):
+            self.chunks.append("\t")
+            if self._tables and self._tables[-1]["rows"]:
+                self._cell = []
+                self._tables[-1]["rows"][-1].append(self._cell)
+        elif tag == "select":
+            self._select = {"name": a.get("name") or "", "id": a.get("id") or "", "type": "select",
+                            "value": "", "label": "", "_picked": False}
+        elif tag == "option" and self._select:
+            self._end_option()
+            self._option = [a.get("value"), [], "selected" in a]
+        elif tag == "input":
+            kind = (a.get("type") or "text").lower()
+            if kind not in ("hidden", "submit", "button", "image", "reset", "password"):
+                control = {"name": a.get("name") or "", "id": a.get("id") or "", "type": kind,
+                           "value": a.get("value") or ("on" if kind in ("checkbox", "radio") else "")}
+                if kind in ("checkbox", "radio"):
+                    control["checked"] = "checked" in a
+                self._add_control(control)
+
+    def handle_endtag(self, tag):
+        if self._skip_tag:
+            if tag == self._skip_tag:
+                self._skip_depth -= 1
+                if self._skip_depth == 0:
+                    self._skip_tag = None
+            return
+        if tag in self._BLOCK:
+            self.chunks.append("\n")
+        if tag == "a" and self._link:
+            href, parts = self._link
+            text = " ".join("".join(parts).split())[:80]
+            if text and not href.startswith("javascript:") and len(self.links) < self.max_links:
+                self.links.append({"href": href, "text": text})
+            self._link = None
+        elif tag == "table" and self._tables:
+            self._tables.pop()
+        elif tag in ("td", "th"):
+            self._cell = None
+        elif tag == "option":
+            self._end_option()
+        elif tag == "select" and self._select:
+            self._end_option()
+            control, self._select = self._select, None
+            del control["_picked"]
+            self._add_control(control)
+
+    def _end_option(self):
+        """Close the open <option>: the explicitly selected one wins, else the first."""
+        if not self._option or not self._select:
+            return
+        value, parts, selected = self._option
+        self._option = None
+        if selected or (not self._select["_picked"] and not self._select["label"] and not self._select["value"]):
+            label = " ".join("".join(parts).split())
+            self._select.update(value=label if value is None else value, label=label, _picked=selected)
+
+    def _add_control(self, control: dict):
+        if len(self.controls) < self.max_controls:
+            self.controls.append(control)
+
+    def handle_data(self, data):
+        if self._skip_tag:
+            return
+        self.chunks.append(data)
+        if self._option:
+            self._option[1].append(data)
+        if self._link:
+            self._link[1].append(data)
+        if self._cell is not None:
+            self._cell.append(data)
+
+    def result(self) -> dict:
+        lines = []
+        for line in "".join(self.chunks).split("\n"):
+            line = "\t".join(" ".join(c.split()) for c in line.split("\t")).strip("\t ")
+            if line:
+                lines.append(line)
+        tables = []
+        for t in self.tables:
+            kept = [([" ".join("".join(c).split()) for c in r], m) for r, m in zip(t["rows"], t["meta"])]
+            kept = [(r, m) for r, m in kept if any(r)]
+            if kept:
+                table = {"rows": [r for r, _ in kept]}
+                if self.row_meta:
+                    table["meta"] = [m for _, m in kept]
+                tables.append(table)
+        out = {"text": "\n".join(lines), "links": self.links, "tables": tables}
+        if self.max_controls:
+            out["controls"] = self.controls
+        return out
+
+
+# Markers that mean the HTML we got is not the real page
+_LOGIN_MARKERS = ("ReturnUrl", "Startpage")
+_INTERSTITIAL_MARKERS = ("cf-chl", "challenge-platform", "just a moment...", "captcha", "are you a robot")
+_JS_ONLY_PAGES = re.compile(r"/Club/Matches/MatchOrder", re.IGNORECASE)
+
+_http = None
+
+
+def _http_client():
+    """Shared async HTTP client (keep-alive connection pool to the hattrick hosts)."""
+    global _http
+    if _http is None:
+        import httpx
+
+        _http = httpx.AsyncClient(
+            follow_redirects=True,
+            timeout=HTTP_TIMEOUT,
+            limits=httpx.Limits(max_connections=MAX_TABS * 2, max_keepalive_connections=MAX_TABS),
+        )
+    return _http
+
+
+async def _close_http():
+    global _http
+    if _http is not None:
+        try:
+            await _http.aclose()
+        except Exception:
+            pass
+        _http = None
+
+
+async def _http_read(target_url: str, fields: dict) -> tuple:
+    """Fetch a read-only page over plain HTTP with the saved session cookies.
+
+    Returns (captured, "") on success or (None, reason) when the browser must take over:
+    no session, login redirect, anti-bot interstitial, or a page that needs JavaScript.
+    """
+    session = _sessions.get()
+    cookies, auth_base = session.get("cookies", []), session.get("auth_base", "")
+    if not cookies or not auth_base:
+        return None, "no_session"
+    url = _to_base(target_url, auth_base)
+    if _JS_ONLY_PAGES.search(url):
+        return None, "js_only"
+
+    import httpx
+
+    jar = httpx.Cookies()
+    for c in cookies:
+        jar.set(c["name"], c["value"], domain=c.get("domain", ""), path=c.get("path", "/"))
+    started = time.monotonic()
+    try:
+        resp = await _http_client().get(url, cookies=jar, headers={
+            "User-Agent": session.get("user_agent") or DEFAULT_USER_AGENT,
+            "Accept": "text/html,application/xhtml+xml",
+            "Accept-Language": "en-US,en;q=0.8",
+        })
+    except Exception:
+        return None, "http_error"
+
+    final_url = str(resp.url)
+    html = resp.text
+    if any(m in final_url for m in _LOGIN_MARKERS) or 'id="inputLoginname"' in html:
+        _sessions.invalidate()
+        return None, "login_redirect"
+    if resp.status_code in (403, 429, 503) or any(m in html[:20000].lower() for m in _INTERSTITIAL_MARKERS):
+        return None, "interstitial"
+    if resp.status_code != 200:
+        return None, f"status_{resp.status_code}"
+
+    parser = _HTMLExtractor(final_url, fields)
+    parser.feed(html)
+    parser.close()
+    data = parser.result()
+    if len(data["text"]) < 200:
+        return None, "js_only"
+    _sessions.mark_validated()
+
+    captured = {"url": final_url, "error": None, "served_by": "http",
+                "text": data["text"] if fields.get("text") else "",
+                "links": data["links"], "tables": data["tables"],
+                "nav_s": time.monotonic() - started}
+    if "controls" in data:
+        captured["controls"] = data["controls"]
+    return captured, ""
+
+
+async def _fetch_page(target_url: str, fields: dict) -> dict:
+    """Read-only page fetch: HTTP fast path first, browser when HTTP can't serve it."""
+    if HTTP_READS:
+        captured, reason = await _http_read(target_url, fields)
+        if captured is not None:
+            _stats["served_http"] += 1
+            return captured
+        _stats[f"http_fallback:{reason}"] += 1
+    _stats["served_browser"] += 1
+    return await _open_page(target_url, fields=fields)
+
+
+# ---------------------------------------------------------------------------
+# Page store (SQLite scrape history)
+# ---------------------------------------------------------------------------
+
+class _PageStore:
+    """Every successful extraction, indexed by canonical URL in DATA_DIR/pages.db.
+
+    One row per scrape (timestamp + content hash); the zlib-compressed JSON payload
+    is only stored when the content differs from what that URL already has on
+    disk, so unchanged re-scrapes cost a few bytes. Methods are blocking — call
+    them through asyncio.to_thread.
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS scrapes (
+            id         INTEGER PRIMARY KEY AUTOINCREMENT,
+            url        TEXT NOT NULL,               -- canonical URL (see _canonical)
+            family     TEXT NOT NULL,
+            fetched_at REAL NOT NULL,
+            hash       TEXT NOT NULL,               -- content hash of text/links/tables
+            fields     TEXT NOT NULL,               -- JSON field projection used
+            payload    BLOB                         -- zlib(JSON); NULL when hash already stored
+        );
+        CREATE INDEX IF NOT EXISTS idx_scrapes_url_time ON scrapes(url, fetched_at DESC);
+        CREATE INDEX IF NOT EXISTS idx_scrapes_url_hash ON scrapes(url, hash);
+
+        -- One row per team page (see _TEAM_PAGES), read by modules/hattrick/page-store.js
+        CREATE TABLE IF NOT EXISTS latest (
+            page       TEXT PRIMARY KEY,            -- team, players, matches, training, economy, league
+            url        TEXT NOT NULL,
+            fetched_at REAL NOT NULL,
+            version    TEXT NOT NULL,
+            changed_at REAL NOT NULL,               -- fetched_at of the first read of this version
+            facts      TEXT NOT NULL DEFAULT '{}'   -- JSON from the page's parser (_PAGE_PARSERS)
+        );
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _db(self):
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            conn.executescript(self._SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def save(self, url: str, family: str, data: dict, fields: dict, fetched_at: float) -> str:
+        """Record one scrape; returns its content hash."""
+        digest = data.get("version") or _content_hash(data)
+        payload = {k: data.get(k) for k in ("url", "text", "links", "tables", "served_by")}
+        if "controls" in data:
+            payload["controls"] = data["controls"]
+        with self._lock:
+            db = self._db()
+            known = db.execute(
+                "SELECT 1 FROM scrapes WHERE url = ? AND hash = ? AND payload IS NOT NULL LIMIT 1",
+                (url, digest)).fetchone()
+            db.execute(
+                "INSERT INTO scrapes (url, family, fetched_at, hash, fields, payload) VALUES (?, ?, ?, ?, ?, ?)",
+                (url, family, fetched_at, digest, json.dumps(fields),
+                 None if known else zlib.compress(json.dumps(payload).encode())))
+        return digest
+
+    def publish(self, page: str, url: str, version: str, fetched_at: float, facts: dict):
+        """Upsert the shared `latest` row of a team page."""
+        with self._lock:
+            self._db().execute(
+                "INSERT INTO latest (page, url, fetched_at, version, changed_at, facts) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(page) DO UPDATE SET url = excluded.url, fetched_at = excluded.fetched_at, "
+                "changed_at = CASE WHEN latest.version = excluded.version THEN latest.changed_at "
+                "ELSE excluded.fetched_at END, version = excluded.version, facts = excluded.facts",
+                (page, url, fetched_at, version, fetched_at, json.dumps(facts, ensure_ascii=False)))
+
+    def latest(self, url: str):
+        """Most recent scrape of a URL with its payload, or None."""
+        with self._lock:
+            row = self._db().execute(
+                "SELECT family, fetched_at, hash, fields FROM scrapes WHERE url = ? ORDER BY fetched_at DESC LIMIT 1",
+                (url,)).fetchone()
+        if not row:
+            return None
+        data = self.payload(url, row[2])
+        if data is None:
+            return None
+        data["version"] = row[2]
+        return {"family": row[0], "fetched_at": row[1], "version": row[2],
+                "fields": json.loads(row[3]), "data": data}
+
+    def payload(self, url: str, digest: str):
+        """The extraction stored for a URL + content hash (None if unknown)."""
+        with self._lock:
+            row = self._db().execute(
+                "SELECT payload FROM scrapes WHERE url = ? AND hash = ? AND payload IS NOT NULL LIMIT 1",
+                (url, digest)).fetchone()
+        return json.loads(zlib.decompress(row[0])) if row else None
+
+    def previous(self, url: str, version: str):
+        """Version of the scrape before the latest one of this content (None if none)."""
+        with self._lock:
+            row = self._db().execute(
+                "SELECT hash FROM scrapes WHERE url = ? AND fetched_at < "
+                "(SELECT MAX(fetched_at) FROM scrapes WHERE url = ? AND hash = ?) "
+                "ORDER BY fetched_at DESC LIMIT 1",
+                (url, url, version)).fetchone()
+        return row[0] if row else None
+
+    def history(self, url: str, limit: int = 20) -> list:
+        with self._lock:
+            rows = self._db().execute(
+                "SELECT fetched_at, hash, family FROM scrapes WHERE url = ? ORDER BY fetched_at DESC LIMIT ?",
+                (url, limit)).fetchall()
+        return [{"fetched_at": r[0], "version": r[1], "family": r[2]} for r in rows]
+
+
+def _content_hash(data: dict) -> str:
+    """Version id of an extraction: hash of its text, links, tables (and form controls if read).
+
+    Hrefs are canonicalised and whitespace collapsed first, so the same content reads
+    as the same version whichever wwwNN host or extractor (HTTP / browser) served it.
+    """
+    def norm(value):
+        return " ".join(str(value or "").split())
+
+    content = {
+        "text": norm(data.get("text")),
+        "links": [[_canonical(l.get("href") or ""), norm(l.get("text"))] for l in data.get("links") or []],
+        "tables": [{"rows": [[norm(c) for c in row] for row in t.get("rows") or []],
+                    "links": [[_canonical(h) for h in m.get("links") or []] for m in t.get("meta") or []]}
+                   for t in data.get("tables") or []],
+    }
+    if data.get("controls"):
+        content["controls"] = data["controls"]
+    return hashlib.sha256(json.dumps(content, sort_keys=True, ensure_ascii=False).encode()).hexdigest()[:16]
+
+
+_pages = _PageStore(os.path.join(DATA_DIR, "pages.db"))
+
+
+# ---------------------------------------------------------------------------
+# Circuit breaker
+# ---------------------------------------------------------------------------
+# When hattrick.org is down or crawling, every read would otherwise burn up to
+# TIMEOUT in a browser tab and come back as an empty page — which looks exactly
+# like an expired session. Per page family we watch the last few fetches; once
+# too many fail (or are too slow) the breaker opens, reads fail fast and fall
+# back to the last stored copy, and after a cooldown a single probe fetch decides
+# whether to close it again.
+
+BREAKER_WINDOW = 10  # recent fetches considered per family
+BREAKER_MIN_CALLS = 3
+BREAKER_FAIL_RATIO = 0.5
+BREAKER_SLOW_S = 30.0  # a fetch slower than this counts as a failure
+BREAKER_COOLDOWN_S = int(os.environ.get("HATTRICK_BREAKER_COOLDOWN_S", "120"))
+
+
+class _Breaker:
+    def __init__(self, family: str):
+        self.family = family
+        self.outcomes = deque(maxlen=BREAKER_WINDOW)  # (ok, seconds)
+        self.opened_at = 0.0
+        self.probing = False
+
+    @property
+    def state(self) -> str:
+        if not self.opened_at:
+            return "closed"
+        return "open" if time.time() - self.opened_at < BREAKER_COOLDOWN_S else "half_open"
+
+    def allow(self) -> bool:
+        """May a new fetch start? In half-open state only one (the probe) may."""
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self.probing:
+            self.probing = True
+            return True
+        return False
+
+    def record(self, ok: bool, seconds: float):
+        ok = ok and seconds < BREAKER_SLOW_S
+        if self.opened_at:
+            if not self.probing:
+                return  # a fetch started before the breaker opened — the probe decides
+            self.probing = False
+            if ok:
+                log.info("breaker %s: probe succeeded, closing", self.family)
+                self.opened_at = 0.0
+                self.outcomes.clear()
+            else:
+                self.opened_at = time.time()
+            self.outcomes.append((ok, seconds))
+            return
+        self.outcomes.append((ok, seconds))
+        failures = sum(1 for good, _ in self.outcomes if not good)
+        if len(self.outcomes) >= BREAKER_MIN_CALLS and failures / len(self.outcomes) >= BREAKER_FAIL_RATIO:
+            _stats["breaker_opened"] += 1
+            log.warning("breaker %s: %d/%d recent fetches failed, opening for %ds",
+                        self.family, failures, len(self.outcomes), BREAKER_COOLDOWN_S)
+            self.opened_at = time.time()
+
+    def snapshot(self) -> dict:
+        latencies = sorted(sec for _, sec in self.outcomes)
+        return {
+            "state": self.state,
+            "recent_failures": sum(1 for good, _ in self.outcomes if not good),
+            "recent_calls": len(self.outcomes),
+            "median_latency_s": round(latencies[len(latencies) // 2], 2) if latencies else None,
+        }
+
+
+_breakers = {}  # family → _Breaker
+
+
+def _breaker(family: str) -> _Breaker:
+    if family not in _breakers:
+        _breakers[family] = _Breaker(family)
+    return _breakers[family]
+
+
+# ---------------------------------------------------------------------------
+# Response cache
+# ---------------------------------------------------------------------------
+
+# Page family → URL path pattern and how long an extraction stays fresh (seconds).
+# Checked in order — first match wins. TTL 0 = never cached.
+_FAMILIES = [
+    ("matchorder", r"/Club/Matches/MatchOrder", 0),
+    ("transfers", r"/Transfers?/", 60),
+    ("matches", r"/Club/Matches", 600),
+    ("players", r"/Club/Players", 600),
+    ("training", r"/Club/Training", 900),
+    ("finances", r"/Club/Finances", 900),
+    ("league", r"/World/Series", 3600),
+    ("team", r"/Club/?(Default\.aspx)?$", 900),
+]
+DEFAULT_TTL = 120
+CACHE_MAX_ENTRIES = 200
+
+# HATTRICK_CACHE_TTLS="players=300,league=1800" overrides per family
+_TTL_OVERRIDES = {
+    k.strip().lower(): int(v)
+    for k, _, v in (item.partition("=") for item in os.environ.get("HATTRICK_CACHE_TTLS", "").split(","))
+    if k.strip() and v.strip().isdigit()
+}
+
+# Families where a somewhat old answer now beats a fresh one in 10-15 s: past the
+# TTL (but within this many extra seconds) the cached result is returned at once
+# and refreshed in the background ("revalidating").
+_STALE_OK = {"league": 6 * 3600, "finances": 3600, "team": 3600}
+
+_cache = {}  # canonical URL → {"data", "fields", "family", "fetched_at", "version"}
+_inflight = {}  # canonical URL → (task, fields) of the fetch currently running for it
+_invalidated_at = {}  # family → when hattrick_action last changed it; older stored copies are not reused
+
+
+def _family(url: str) -> str:
+    path = urlsplit(url).path
+    for family, pattern, _ttl in _FAMILIES:
+        if re.search(pattern, path, re.IGNORECASE):
+            return family
+    return "other"
+
+
+def _ttl(family: str) -> int:
+    if family in _TTL_OVERRIDES:
+        return _TTL_OVERRIDES[family]
+    for name, _pattern, ttl in _FAMILIES:
+        if name == family:
+            return ttl
+    return DEFAULT_TTL
+
+
+def _covers(have: dict, want: dict) -> bool:
+    """True if an extraction made with `have` fields contains everything `want` asks for."""
+    return ((have.get("text") or not want.get("text"))
+            and (have.get("links") or 0) >= (want.get("links") or 0)
+            and (have.get("tables") or 0) >= (want.get("tables") or 0)
+            and (have.get("row_meta") or not want.get("row_meta"))
+            and (have.get("controls") or 0) >= (want.get("controls") or 0))
+
+
+def _invalidate(families: set):
+    """Drop cached extractions for these page families (after hattrick_action changed them)."""
+    now = time.time()
+    for family in families:
+        _invalidated_at[family] = now
+    for key in [k for k, e in _cache.items() if e["family"] in families]:
+        del _cache[key]
+        _stats["cache_invalidations"] += 1
+
+
+async def _read_page(target_url: str, fields: dict = None, force: bool = False) -> dict:
+    """Cached read of a page. Fresh cache hits come back with cached=True and cache_age;
+    cache_key is the canonical URL the page is cached and stored under, fetched_at
+    when it was read from the site.
+
+    Stale entries of _STALE_OK families are returned with revalidating=True while a
+    background task re-reads the page.
+
+    Concurrent misses for the same canonical URL share one fetch: later callers
+    await the first caller's task (shielded, so one caller giving up doesn't
+    cancel it for the others).
+    """
+    fields = FIELDS_ALL if fields is None else fields
+    if target_url.startswith("/"):
+        target_url = BASE + target_url
+    key, family = _canonical(target_url), _family(target_url)
+    ttl = _ttl(family)
+
+    entry = _cache.get(key)
+    if entry is None and not force and ttl > 0:
+        # Nothing in memory (e.g. after a restart) — the page store may still have it
+        try:
+            entry = await asyncio.to_thread(_pages.latest, key)
+        except Exception as e:
+            log.warning("page store read failed: %s", e)
+        if entry and entry["fetched_at"] < _invalidated_at.get(family, 0):
+            entry = None  # read before hattrick_action changed the page
+        if entry:
+            _cache[key] = entry
+    if entry and not force and ttl > 0 and _covers(entry["fields"], fields):
+        age = time.time() - entry["fetched_at"]
+        hit = {**entry["data"], "cached": True, "cache_age": round(age), "cache_key": key,
+               "fetched_at": entry["fetched_at"], "revalidating": False}
+        if age < ttl:
+            _stats["cache_hits"] += 1
+            return hit
+        if age < ttl + _STALE_OK.get(family, 0):
+            _stats["stale_served"] += 1
+            task = _start_fetch(key, family, target_url, fields)
+            if task:
+                task.add_done_callback(_log_failure)
+            return {**hit, "revalidating": task is not None}
+
+    _stats["cache_misses"] += 1
+    task = _start_fetch(key, family, target_url, fields)
+    if task is None:
+        return await _breaker_fallback(key, family, target_url, entry)
+    data = await asyncio.shield(task)
+    return {**data, "cached": False, "cache_age": 0, "cache_key": key,
+            "fetched_at": data.get("fetched_at"), "revalidating": False}
+
+
+def _start_fetch(key: str, family: str, target_url: str, fields: dict):
+    """The running fetch of this page, or a new one — None while the family's breaker is open."""
+    flight = _inflight.get(key)
+    if flight and _covers(flight[1], fields):
+        # Identical scrape already running — share its result instead of a second session
+        _stats["coalesced"] += 1
+        return flight[0]
+    if not _breaker(family).allow():
+        return None
+    task = asyncio.ensure_future(_fetch_and_cache(key, family, target_url, fields))
+    _inflight[key] = (task, fields)
+    task.add_done_callback(lambda t: _inflight.pop(key, None) if _inflight.get(key, (None,))[0] is t else None)
+    return task
+
+
+async def _breaker_fallback(key: str, family: str, target_url: str, entry: dict = None) -> dict:
+    """Fail fast while the site is down: the last known copy of the page, marked stale."""
+    _stats["breaker_rejected"] += 1
+    if entry is None:
+        try:
+            entry = await asyncio.to_thread(_pages.latest, key)
+        except Exception as e:
+            log.warning("page store read failed: %s", e)
+    if entry is None:
+        return {"url": target_url, "text": "", "links": [], "tables": [], "served_by": None,
+                "cached": False, "cache_age": 0, "cache_key": key, "site_down": True,
+                "error": f"hattrick.org is not responding ({family} reads failing) and no stored copy exists; "
+                         f"retry in {BREAKER_COOLDOWN_S}s"}
+    return {**entry["data"], "cached": True, "cache_age": round(time.time() - entry["fetched_at"]),
+            "cache_key": key, "fetched_at": entry["fetched_at"], "revalidating": False,
+            "stale": True, "site_down": True}
+
+
+def _log_failure(task: asyncio.Future):
+    if not task.cancelled() and task.exception():
+        log.warning("background refresh failed: %s", task.exception())
+
+
+async def _fetch_and_cache(key: str, family: str, target_url: str, fields: dict) -> dict:
+    started = time.monotonic()
+    try:
+        data = await _fetch_page(target_url, fields)
+    except Exception:
+        _breaker(family).record(False, time.monotonic() - started)
+        raise
+    # Slowness is judged on the page load alone, not on tab waits, launches or logins
+    _breaker(family).record(not data.get("error") and bool(data.get("text")),
+                            data.get("nav_s", time.monotonic() - started))
+    if data.get("error") or not data.get("text"):
+        return data
+    fetched_at = time.time()
+    data = {**data, "version": _content_hash(data), "fetched_at": fetched_at}
+    page = _TEAM_PAGE_KEYS.get(key)
+    try:
+        await asyncio.to_thread(_pages.save, key, family, data, fields, fetched_at)
+        if page:
+            await asyncio.to_thread(_pages.publish, page, key, data["version"], fetched_at, _page_facts(page, data))
+    except Exception as e:
+        log.warning("page store write failed: %s", e)
+    previous = _cache.pop(key, None)
+    if _ttl(family) > 0:
+        _cache[key] = {"data": data, "fields": fields, "family": family,
+                       "fetched_at": fetched_at, "version": data["version"]}
+        while len(_cache) > CACHE_MAX_ENTRIES:
+            del _cache[next(iter(_cache))]
+    if previous is None or previous.get("version") != data["version"]:
+        await _notify_updated(key)
+    return data
+
+
+def _meta(data: dict) -> dict:
+    """Provenance fields every read tool returns alongside its payload."""
+    return {
+        "served_by": "cache" if data.get("cached") else data.get("served_by"),
+        "cached": bool(data.get("cached")),
+        "cache_age": data.get("cache_age", 0),
+        "version": data.get("version"),
+        "fetched_at": round(data["fetched_at"]) if data.get("fetched_at") else None,
+        "revalidating": bool(data.get("revalidating")),
+        "stale": bool(data.get("stale")),
+        "site_down": bool(data.get("site_down")),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Delta responses
+# ---------------------------------------------------------------------------
+
+DELTA_MAX_LINES = 200
+_RAW_KEYS = ("text", "links", "tables", "player_links", "match_links")
+_BULK_KEYS = _RAW_KEYS + ("players", "fixtures", "finances", "standings", "training")
+
+
+def _diff_text(old: str, new: str) -> dict:
+    a, b = (old or "").splitlines(), (new or "").splitlines()
+    added, removed = [], []
+    for tag, i1, i2, j1, j2 in difflib.SequenceMatcher(None, a, b, autojunk=False).get_opcodes():
+        if tag in ("replace", "delete"):
+            removed += a[i1:i2]
+        if tag in ("replace", "insert"):
+            added += b[j1:j2]
+    return {"added": added[:DELTA_MAX_LINES], "removed": removed[:DELTA_MAX_LINES]}
+
+
+def _diff_tables(old: list, new: list) -> list:
+    """Per-table added/removed rows (tables matched by position)."""
+    changes = []
+    for i in range(max(len(old or []), len(new or []))):
+        a = Counter(tuple(r) for r in (old[i]["rows"] if i < len(old) else []))
+        b = Counter(tuple(r) for r in (new[i]["rows"] if i < len(new) else []))
+        added, removed = list((b - a).elements()), list((a - b).elements())
+        if added or removed:
+            changes.append({"table": i, "added": [list(r) for r in added], "removed": [list(r) for r in removed]})
+    return changes
+
+
+async def _respond(data: dict, body: dict, mode: str = "full", since: str = "", parsed: bool = False) -> str:
+    """JSON reply of a read tool: body + error + provenance.
+
+    mode="delta" replaces the bulky keys (text, links, tables) with what changed
+    against version `since` — by default the version read before this one — or
+    "unchanged": true when nothing did. mode="structured" keeps only the parsed
+    records (players, fixtures, ...) and drops the raw page content — but only when
+    `parsed` says the records hold the page's data; otherwise (no parser, or it
+    found nothing) the full reply is returned so the caller can still read the page.
+    """
+    out = {**body, "error": data.get("error"), **_meta(data)}
+    if mode == "structured" and parsed:
+        return json.dumps({k: v for k, v in out.items() if k not in _RAW_KEYS})
+    version = data.get("version")
+    if mode != "delta" or data.get("error") or not version:
+        return json.dumps(out)
+
+    key = data.get("cache_key") or _canonical(data["url"])
+    try:
+        since = since or await asyncio.to_thread(_pages.previous, key, version)
+        base = await asyncio.to_thread(_pages.payload, key, since) if since and since != version else None
+    except Exception as e:
+        log.warning("page store read failed: %s", e)
+        base = None
+    if since == version:
+        _stats["delta_unchanged"] += 1
+        return json.dumps({**{k: v for k, v in out.items() if k not in _BULK_KEYS}, "since": since, "unchanged": True})
+    if base is None:
+        # Nothing to diff against — the full payload is the delta
+        return json.dumps({**out, "since": since or None, "delta_base": "missing"})
+
+    _stats["delta_changed"] += 1
+    return json.dumps({
+        **{k: v for k, v in out.items() if k not in _BULK_KEYS},
+        "since": since,
+        "unchanged": False,
+        "text_changes": _diff_text(base.get("text"), data.get("text")),
+        "table_changes": _diff_tables(base.get("tables") or [], data.get("tables") or []),
+    })
+
+
+# ---------------------------------------------------------------------------
+# Session keepalive
+# ---------------------------------------------------------------------------
+
+async def _probe_session() -> "bool | None":
+    """Cheap "still logged in?" check over HTTP. None if HTTP couldn't tell."""
+    captured, reason = await _http_read(f"{BASE}/en/MyHattrick/Dashboard.aspx", FIELDS_TEXT)
+    if captured is not None:
+        return True
+    return False if reason in ("login_redirect", "no_session") else None
+
+
+async def _keepalive_tick():
+    """Re-validate the session, or log in again before it is expected to expire.
+
+    The point is that foreground tool calls never pay the slow login path: the
+    background does it while nobody is waiting. Pre-emptive logins start only once a
+    real expiry has been observed — until then there is no lifetime to go by, and
+    logging in early would keep one from ever being seen.
+    """
+    _stats["keepalive_checks"] += 1
+    lifetime = _sessions.expected_lifetime()
+    near_expiry = lifetime is not None and _sessions.age() > lifetime * 0.8
+
+    if not near_expiry:
+        if _sessions.validated_within(KEEPALIVE_S):
+            return  # foreground traffic already proved it works
+        if await _probe_session():
+            return
+
+    _stats["keepalive_refreshes"] += 1
+    log.info("keepalive: refreshing session (age %.0fs, expected lifetime %s)", _sessions.age(),
+             f"{lifetime:.0f}s" if lifetime else "unknown")
+    if near_expiry:
+        # If it has already expired, the probe's login redirect records the lifetime
+        await _probe_session()
+        async with _browser.tab() as page:
+            await _login_once(page, _sessions.get().get("logged_in_at", 0), fresh=True)
+    else:
+        # Expired (or HTTP inconclusive): the normal fast path re-validates or logs in
+        await _open_page(f"{BASE}/en/MyHattrick/Dashboard.aspx", fields=FIELDS_TEXT)
+
+
+async def _keepalive_loop():
+    while True:
+        await asyncio.sleep(KEEPALIVE_S)
+        try:
+            await _keepalive_tick()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            log.warning("keepalive failed: %s", e)
+
+
+# ---------------------------------------------------------------------------
+# Prefetch before scheduled work
+# ---------------------------------------------------------------------------
+# The agent reads the team pages right after the weekly cron's needs-scrape flag
+# and right when an ht-* cron fires. Reading them a few minutes earlier means
+# those calls are answered from the cache instead of waiting on cold scrapes.
+
+SELA_DATA_DIR = os.path.dirname(DATA_DIR)
+NEEDS_SCRAPE_PATH = os.path.join(SELA_DATA_DIR, "state", "hattrick-needs-scrape.json")
+SELA_DB_PATH = os.path.join(SELA_DATA_DIR, "sela.db")
+PREFETCH_POLL_S = 60
+PREFETCH_WINDOW_S = 6 * 3600  # a pending needs-scrape flag older than this is ignored
+PREFETCH_PAGES = ("team", "players", "matches", "training")
+
+
+def _prefetch_windows() -> set:
+    """Epoch seconds of upcoming agent reads: the pending needs-scrape request and
+    the next run of every enabled ht-* cron (nextRun as stored by lib/crons.js)."""
+    windows = set()
+    try:
+        with open(NEEDS_SCRAPE_PATH, encoding="utf-8") as f:
+            scheduled = json.load(f).get("scheduledAt")
+        if scheduled:
+            windows.add(scheduled / 1000)
+    except (OSError, ValueError, AttributeError):
+        pass
+    if os.path.exists(SELA_DB_PATH):
+        try:
+            conn = sqlite3.connect(f"file:{SELA_DB_PATH}?mode=ro", uri=True, timeout=1)
+            try:
+                rows = conn.execute("SELECT state FROM crons WHERE enabled = 1 AND name LIKE 'ht-%'").fetchall()
+            finally:
+                conn.close()
+            for (state,) in rows:
+                next_run = json.loads(state or "{}").get("nextRun")
+                if next_run:
+                    windows.add(next_run / 1000)
+        except (sqlite3.Error, ValueError) as e:
+            log.debug("prefetch: can't read cron schedule: %s", e)
+    return windows
+
+
+async def _prefetch_loop():
+    done = set()
+    while True:
+        await asyncio.sleep(PREFETCH_POLL_S)
+        try:
+            windows = await asyncio.to_thread(_prefetch_windows)
+            now = time.time()
+            due = [w for w in windows if w not in done and w - PREFETCH_LEAD_S <= now < w + PREFETCH_WINDOW_S]
+            done &= windows
+            if not due:
+                continue
+            done.update(due)
+            _stats["prefetch_runs"] += 1
+            log.info("prefetch: warming %s ahead of %d scheduled read(s)", ", ".join(PREFETCH_PAGES), len(due))
+            await asyncio.gather(*(_REFRESH_READERS[n](force=True) for n in PREFETCH_PAGES))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            log.warning("prefetch failed: %s", e)
+
+
 def _trunc(text: str, limit: int = 4000) -> str:
     return text[:limit] + "\n...(truncated)" if len(text) > limit else text
 
@@ -200,17 +1659,494 @@ def _filter_links(links: list, pattern: str) -> list:
     return [l for l in links if pattern.lower() in l.get("href", "").lower()]
 
 
+# ---------------------------------------------------------------------------
+# Page parsers
+# ---------------------------------------------------------------------------
+# Deterministic extraction of typed records from the English page text, so the
+# agent doesn't have to rebuild them from prose. Field names follow what
+# modules/hattrick/hattrick.js stores (appendSkillHistorySnapshot etc.).
+
+# Hattrick's skill/form/stamina denominations, 0-20
+SKILL_LEVELS = {
+    "non-existent": 0, "disastrous": 1, "wretched": 2, "poor": 3, "weak": 4, "inadequate": 5,
+    "passable": 6, "solid": 7, "excellent": 8, "formidable": 9, "outstanding": 10, "brilliant": 11,
+    "magnificent": 12, "world class": 13, "supernatural": 14, "titanic": 15, "extra-terrestrial": 16,
+    "mythical": 17, "magical": 18, "utopian": 19, "divine": 20,
+}
+_LEVEL_RE = "|".join(re.escape(w).replace(r"\ ", r"\s+").replace(r"\-", r"[-\s]?")
+                     for w in sorted(SKILL_LEVELS, key=len, reverse=True))
+_NUMBER = r"(\d{1,3}(?:[ \u00a0\u202f.,']\d{3})+|\d+)"
+
+# record field → labels it appears under on the page
+_PLAYER_SKILLS = {
+    "form": r"Form",
+    "stamina": r"Stamina",
+    "keeper": r"Keeper|Goalkeeping",
+    "defending": r"Defending|Defence|Defense",
+    "playmaking": r"Playmaking",
+    "winger": r"Winger|Wing",
+    "passing": r"Passing",
+    "scoring": r"Scoring",
+    "set_pieces": r"Set\s*pieces",
+}
+_SPECIALTIES = ("Technical", "Quick", "Powerful", "Unpredictable", "Head", "Resilient", "Support")
+
+
+def _number(raw: str):
+    digits = re.sub(r"\D", "", raw or "")
+    return int(digits) if digits else None
+
+
+def _level(label: str, segment: str):
+    """Level of a labelled skill in a segment: "Scoring: passable (6)" → 6."""
+    m = re.search(rf"\b(?:{label})\b\s*:?\s*({_LEVEL_RE})(?:\s*\((\d+)\))?", segment, re.IGNORECASE)
+    if not m:
+        return None
+    if m.group(2):
+        return int(m.group(2))
+    word = re.sub(r"[-\s]+", " ", m.group(1).lower())
+    return next((v for k, v in SKILL_LEVELS.items() if re.sub(r"[-\s]+", " ", k) == word), None)
+
+
+def _segments(text: str, links: list, pattern: str) -> list:
+    """Split page text into one segment per linked entity (e.g. player), in page order.
+
+    Returns [(id, name, segment_text)] — a segment runs from the entity's link text
+    to the next entity's.
+    """
+    entities, seen = [], set()
+    for link in links:
+        m = re.search(pattern, link.get("href", ""), re.IGNORECASE)
+        name = (link.get("text") or "").strip()
+        if not m or not name or m.group(1) in seen:
+            continue
+        seen.add(m.group(1))
+        entities.append((m.group(1), name))
+    found, pos = [], 0
+    for entity_id, name in entities:
+        at = text.find(name, pos)
+        if at < 0:
+            continue
+        found.append((entity_id, name, at))
+        pos = at + len(name)
+    return [(entity_id, name, text[at:found[i + 1][2] if i + 1 < len(found) else len(text)])
+            for i, (entity_id, name, at) in enumerate(found)]
+
+
+def _parse_players(data: dict) -> list:
+    """Player records from the Players page, in appendSkillHistorySnapshot's schema.
+
+    TSI is given as both `tsi` (saveSnapshot / appendTsiSnapshot) and `TSI` (skill history).
+    """
+    players = []
+    for player_id, name, seg in _segments(data.get("text") or "", data.get("links") or [], r"PlayerID=(\d+)"):
+        age = re.search(r"(\d{2})\s+years", seg)
+        tsi = re.search(rf"\bTSI\b\s*:?\s*{_NUMBER}", seg)
+        wage = re.search(rf"\b(?:Wage|Salary)\b\s*:?\s*(?:[^\d\s]{{1,4}}\s*)?{_NUMBER}", seg, re.IGNORECASE)
+        specialty = re.search(rf"\bSpecialty\b\s*:?\s*({'|'.join(_SPECIALTIES)})", seg, re.IGNORECASE)
+        tsi = _number(tsi.group(1)) if tsi else None
+        record = {
+            "playerID": int(player_id),
+            "name": name,
+            "age": int(age.group(1)) if age else None,
+            "specialty": specialty.group(1).capitalize() if specialty else None,
+            "tsi": tsi,
+            "TSI": tsi,
+            "wage": _number(wage.group(1)) if wage else None,
+        }
+        for field, label in _PLAYER_SKILLS.items():
+            record[field] = _level(label, seg)
+        players.append(record)
+    return players
+
+
+_DATE = re.compile(r"\b(\d{4})-(\d{1,2})-(\d{1,2})|\b(\d{1,2})([./-])(\d{1,2})\5(\d{4})")
+_TIME = re.compile(r"\b(\d{1,2}):(\d{2})\b")
+_SCORE = re.compile(r"^\s*(\d{1,2})\s*-\s*(\d{1,2})\s*$")
+_MATCH_TYPES = (("qualif", "qualification"), ("league", "league"), ("cup", "cup"), ("friendly", "friendly"),
+                ("masters", "masters"), ("tournament", "tournament"), ("ladder", "tournament"))
+
+
+def _parse_datetime(text: str):
+    """First date (+ time) in a string → (ISO local datetime, epoch ms), or (None, None).
+
+    Accepts yyyy-mm-dd, dd.mm.yyyy, dd-mm-yyyy and mm/dd/yyyy — the formats hattrick's
+    date setting offers. Times are the site's local time, read as this machine's.
+    """
+    m = _DATE.search(text or "")
+    if not m:
+        return None, None
+    if m.group(1):
+        year, month, day = int(m.group(1)), int(m.group(2)), int(m.group(3))
+    elif m.group(5) == "/":
+        month, day, year = int(m.group(4)), int(m.group(6)), int(m.group(7))
+    else:
+        day, month, year = int(m.group(4)), int(m.group(6)), int(m.group(7))
+    t = _TIME.search(text[m.end():])
+    hour, minute = (int(t.group(1)), int(t.group(2))) if t else (0, 0)
+    try:
+        when = datetime(year, month, day, hour, minute)
+    except ValueError:
+        return None, None
+    return when.isoformat(timespec="minutes"), int(when.timestamp() * 1000)
+
+
+def _parse_matches(data: dict) -> list:
+    """Fixture/result records from the Matches page tables (needs row_meta)."""
+    matches = []
+    now_ms = time.time() * 1000
+    for table in data.get("tables") or []:
+        for cells, meta in zip(table.get("rows") or [], table.get("meta") or []):
+            hrefs = meta.get("links") or []
+            match_id = next((m.group(1) for h in hrefs if (m := re.search(r"matchID=(\d+)", h, re.IGNORECASE))), None)
+            if not match_id:
+                continue
+            team_ids = []
+            for h in hrefs:
+                m = re.search(r"TeamID=(\d+)", h, re.IGNORECASE)
+                if m and m.group(1) not in team_ids and "matchid=" not in h.lower():
+                    team_ids.append(m.group(1))
+            home_id, away_id = (team_ids + [None, None])[:2]
+            iso, epoch_ms = _parse_datetime(" ".join(cells))
+            score = next((m for c in cells if (m := _SCORE.match(c))), None)
+            if epoch_ms and epoch_ms > now_ms:
+                score = None  # a fixture can't have a result yet, whatever the cell says
+            teams = next((c for c in cells if re.search(r"\S\s+-\s+\S", c) and not _SCORE.match(c)), "")
+            home, _, away = teams.partition(" - ")
+            labels = " ".join(meta.get("icons") or []).lower() + " " + " ".join(cells).lower()
+            matches.append({
+                "matchID": int(match_id),
+                "type": next((name for key, name in _MATCH_TYPES if key in labels), None),
+                "date": iso,
+                "matchDate": epoch_ms,
+                "homeTeam": home.strip() or None,
+                "awayTeam": away.strip() or None,
+                "homeTeamID": int(home_id) if home_id else None,
+                "awayTeamID": int(away_id) if away_id else None,
+                "isHome": None,
+                "opponentTeamID": None,
+                "score": f"{score.group(1)}-{score.group(2)}" if score else None,
+                "status": "finished" if score else "upcoming",
+                "goalsFor": None, "goalsAgainst": None, "result": None,
+            })
+
+    # Our side of each match: by TeamID when the row links the teams, otherwise
+    # by the one team name that appears in every row
+    names = Counter(n for m in matches for n in {m["homeTeam"], m["awayTeam"]} if n)
+    own_name = names.most_common(1)[0][0] if len(matches) > 1 and names and names.most_common(1)[0][1] == len(matches) else None
+    own = int(TEAM_ID) if str(TEAM_ID).isdigit() else None
+    for m in matches:
+        if own and own in (m["homeTeamID"], m["awayTeamID"]):
+            m["isHome"] = m["homeTeamID"] == own
+        elif own_name and own_name in (m["homeTeam"], m["awayTeam"]):
+            m["isHome"] = m["homeTeam"] == own_name
+        else:
+            continue
+        m["opponentTeamID"] = m["awayTeamID"] if m["isHome"] else m["homeTeamID"]
+        if m["score"]:
+            home_goals, away_goals = map(int, m["score"].split("-"))
+            gf, ga = (home_goals, away_goals) if m["isHome"] else (away_goals, home_goals)
+            m.update(goalsFor=gf, goalsAgainst=ga, result="W" if gf > ga else "D" if gf == ga else "L")
+    return matches
+
+
+def _matches_facts(data: dict) -> dict:
+    matches = _parse_matches(data)
+    finished = [m["matchDate"] for m in matches if m["status"] == "finished" and m["matchDate"]]
+    upcoming = [m["matchDate"] for m in matches if m["status"] == "upcoming" and m["matchDate"]]
+    return {
+        "matches": matches,
+        "last_match_at": max(finished) if finished else None,
+        "next_match_at": min(upcoming) if upcoming else None,
+    }
+
+
+_MONEY = re.compile(r"([-\u2212(]?)\s*(?:[^\d\s-]{1,4}\s*)?(\d{1,3}(?:[ \u00a0\u202f.,']\d{3})+|\d+)(?:[.,](\d{1,2}))?(?!\d)")
+
+
+def _parse_money(text: str):
+    """Currency amount → int: "1 234 567 NIS", "1,234,567 US$", "1.234 €", "−12 300", "(500)".
+
+    Thousands separators may be spaces, NBSP, dots, commas or apostrophes; a 1-2 digit
+    tail after a separator is a decimal part and is dropped. None if there's no number.
+    """
+    m = _MONEY.search(text or "")
+    if not m:
+        return None
+    value = int(re.sub(r"\D", "", m.group(2)))
+    return -value if m.group(1) else value
+
+
+# Finance line label → key; first match wins, checked against the lowercased label
+_FINANCE_LINES = (
+    ("total", "total"), ("result", "result"), ("profit", "result"), ("spectator", "spectators"), ("sponsor", "sponsors"), ("sold", "player_sales"),
+    ("player sales", "player_sales"), ("commission", "commission"), ("wage", "wages"), ("salar", "wages"),
+    ("arena", "arena"), ("stadium", "arena"), ("construction", "construction"), ("staff", "staff"),
+    ("coach", "staff"), ("youth", "youth"), ("bought", "player_purchases"), ("purchase", "player_purchases"),
+    ("interest", "interest"), ("temporary", "temporary"), ("other", "other"),
+)
+
+
+def _finance_key(label: str) -> str:
+    low = label.lower()
+    return next((key for needle, key in _FINANCE_LINES if needle in low),
+                re.sub(r"\W+", "_", low).strip("_"))
+
+
+def _parse_finances(data: dict) -> dict:
+    """Typed finances record from the Finances page (amounts of the first column, i.e. this week).
+
+    Lines are sorted into income / expenses by the "Income" / "Expenses" headings of
+    their table column (side-by-side layout) or the last heading row above them.
+    """
+    income, expenses = {}, {}
+    for table in data.get("tables") or []:
+        columns = {}  # column index → "income" | "expenses" from a heading row
+        section = None
+        for cells in table.get("rows") or []:
+            headings = {i: ("income" if "income" in c.lower() else "expenses")
+                        for i, c in enumerate(cells) if re.search(r"\b(income|expenses?)\b", c, re.IGNORECASE)}
+            if headings and all(_parse_money(c) is None for c in cells):
+                if len(headings) > 1:
+                    columns = headings
+                else:
+                    section = next(iter(headings.values()))
+                continue
+            # A row holds one or more (label, amount, amount...) groups
+            i = 0
+            while i < len(cells):
+                label = cells[i].strip()
+                amount = _parse_money(cells[i + 1]) if i + 1 < len(cells) else None
+                if label and _parse_money(label) is None and amount is not None:
+                    side = columns[max(k for k in columns if k <= i)] if columns and min(columns) <= i else section
+                    if side:
+                        (income if side == "income" else expenses).setdefault(_finance_key(label), amount)
+                    i += 2
+                    while i < len(cells) and _parse_money(cells[i]) is not None:
+                        i += 1  # later columns (last week etc.)
+                else:
+                    i += 1
+
+    text = data.get("text") or ""
+    cash = re.search(r"\b(?:Cash(?:\s+funds)?|Current\s+cash|Balance)\b\s*:?\s*([^\n\t]+)", text, re.IGNORECASE)
+    weekly_income = income.pop("total", None)
+    weekly_expenses = expenses.pop("total", None)
+    result = income.pop("result", None)
+    result = expenses.pop("result", result)
+    if weekly_income is None and income:
+        weekly_income = sum(income.values())
+    if weekly_expenses is None and expenses:
+        weekly_expenses = sum(expenses.values())
+    return {
+        "cash": _parse_money(cash.group(1)) if cash else None,
+        "weeklyIncome": weekly_income,
+        "weeklyExpenses": weekly_expenses,
+        "weeklyNetProfit": (weekly_income - weekly_expenses if weekly_income is not None and weekly_expenses is not None
+                            else result),
+        "wageTotal": expenses.get("wages"),
+        "income": income,
+        "expenses": expenses,
+    }
+
+
+_GOALS = re.compile(r"^\s*(\d+)\s*[-:]\s*(\d+)\s*$")
+
+
+def _parse_standings(data: dict) -> dict:
+    """League table from the Series page (needs row_meta for TeamIDs).
+
+    Rows are recognised by their single team link; the numbers after it are read as
+    played, W, D, L, goals (either "GF - GA" or two columns), goal difference, points.
+    Returns {"standings": [...], "own": {position, totalTeams, points, round, goalDiff} | None}.
+    """
+    own_id = int(TEAM_ID) if str(TEAM_ID).isdigit() else None
+    standings = []
+    for table in data.get("tables") or []:
+        rows = table.get("rows") or []
+        for cells, meta in zip(rows, table.get("meta") or [{}] * len(rows)):
+            team_ids = {int(m.group(1)) for h in meta.get("links") or []
+                        if (m := re.search(r"[?&]TeamID=(\d+)", h, re.IGNORECASE)) and "matchid=" not in h.lower()}
+            team_at = next((i for i, c in enumerate(cells) if re.search(r"[^\d\s.:+\-\u2212]", c)), None)
+            if team_at is None or len(team_ids) > 1:
+                continue
+            before = [c.strip().rstrip(".") for c in cells[:team_at]]
+            ints, goals, diff = [], None, None
+            for c in (c.strip() for c in cells[team_at + 1:]):
+                if (m := _GOALS.match(c)):
+                    goals = (int(m.group(1)), int(m.group(2)))
+                elif re.fullmatch(r"[+\-\u2212]\d+", c):
+                    diff = int(c.replace("\u2212", "-"))
+                elif c.isdigit():
+                    ints.append(int(c))
+            row = {"played": None, "won": None, "drawn": None, "lost": None, "goalsFor": None, "goalsAgainst": None}
+            if goals and len(ints) >= 5:
+                row.update(zip(("played", "won", "drawn", "lost"), ints[:4]))
+            elif goals and len(ints) >= 2:
+                row["played"] = ints[0]
+            elif not goals and len(ints) >= 7:
+                row.update(zip(("played", "won", "drawn", "lost", "goalsFor", "goalsAgainst"), ints[:6]))
+            else:
+                continue  # not a standings row
+            if goals:
+                row["goalsFor"], row["goalsAgainst"] = goals
+            team_id = next(iter(team_ids), None)
+            standings.append({
+                "position": int(before[0]) if before and before[0].isdigit() else len(standings) + 1,
+                "teamId": team_id,
+                "teamName": cells[team_at].strip(),
+                **row,
+                "goalDiff": row["goalsFor"] - row["goalsAgainst"] if row["goalsFor"] is not None else diff,
+                "points": ints[-1],
+                "isOwn": team_id is not None and team_id == own_id,
+            })
+        if standings:
+            break  # the first table that parsed is the standings
+
+    own = next((t for t in standings if t["isOwn"]), None)
+    return {
+        "standings": standings,
+        "own": {"position": own["position"], "totalTeams": len(standings), "points": own["points"],
+                "round": own["played"], "goalDiff": own["goalDiff"]} if own else None,
+    }
+
+
+# Training dropdown value → type (the codes hattrick_action selects with)
+TRAINING_TYPES = {9: "Goalkeeping", 3: "Defense", 8: "Playmaking", 5: "Wings", 7: "Passing",
+                  4: "Scoring", 2: "Set Pieces"}
+_TRAINING_NAMES = {"goalkeeping": 9, "keeper": 9, "defending": 3, "defense": 3, "defence": 3,
+                   "playmaking": 8, "winger": 5, "wings": 5, "crossing": 5, "passing": 7,
+                   "short passes": 7, "scoring": 4, "shooting": 4, "set pieces": 2}
+_PERCENT = re.compile(r"(\d{1,3})\s*%")
+
+
+def _training_code(label: str):
+    low = " ".join((label or "").lower().split())
+    return next((code for name, code in sorted(_TRAINING_NAMES.items(), key=lambda kv: -len(kv[0]))
+                 if name in low), None)
+
+
+def _control_number(controls: list, pattern: str):
+    """Numeric value of the first select/input whose name or id matches `pattern`."""
+    for c in controls:
+        if re.search(pattern, f"{c.get('name')} {c.get('id')}", re.IGNORECASE):
+            n = _number(c.get("value") or c.get("label"))
+            if n is not None:
+                return n
+    return None
+
+
+def _parse_training(data: dict) -> dict:
+    """Training settings and slots from the Training page (needs controls and row_meta).
+
+    Type, intensity and stamina share come from the form's current values, falling back
+    to the page text when the form isn't there (read-only view). Each player row with a
+    PlayerID link becomes a slot: the training share shown for it (a percentage, or
+    full / partial / osmosis / none wording in the cell or icon titles).
+    """
+    controls = data.get("controls") or []
+    text = data.get("text") or ""
+
+    code = None
+    for c in controls:
+        if c.get("type") == "select" and re.search(r"train", f"{c.get('name')} {c.get('id')}", re.IGNORECASE):
+            value = _number(c.get("value"))
+            code = value if value in TRAINING_TYPES else _training_code(c.get("label"))
+            if code:
+                break
+    if code is None:
+        code = next((c for m in re.finditer(r"Training\b[^\n:]{0,20}:\s*([^\n\t]+)", text, re.IGNORECASE)
+                     if (c := _training_code(m.group(1)))), None)
+
+    def from_text(label):
+        m = re.search(rf"{label}[^\n\d]{{0,40}}(\d{{1,3}})\s*%", text, re.IGNORECASE)
+        return int(m.group(1)) if m else None
+
+    intensity = _control_number(controls, r"intensity")
+    stamina = _control_number(controls, r"stamina|condition")
+    # "Coach: Anna Kovacs (solid)" — the level word may follow the coach's name
+    coach_level = _level(r"(?:Coach|Trainer)[^\n]*?", text)
+
+    players = []
+    for table in data.get("tables") or []:
+        rows = table.get("rows") or []
+        for cells, meta in zip(rows, table.get("meta") or [{}] * len(rows)):
+            ids = [m.group(1) for h in meta.get("links") or []
+                   if (m := re.search(r"[?&]PlayerID=(\d+)", h, re.IGNORECASE))]
+            if not ids:
+                continue
+            row_text = " ".join(cells + (meta.get("icons") or [])).lower()
+            pct = next((int(m.group(1)) for c in cells if (m := _PERCENT.search(c))), None)
+            if pct is None:
+                if "osmosis" in row_text:
+                    pct = 25
+                elif "partial" in row_text or "half" in row_text:
+                    pct = 50
+                elif "full" in row_text:
+                    pct = 100
+                elif "no training" in row_text or "not trained" in row_text:
+                    pct = 0
+            name = next((c.strip() for c in cells if re.search(r"[^\W\d_]{2}", c) and "%" not in c), "")
+            players.append({
+                "playerID": int(ids[0]),
+                "name": name,
+                "share": pct,
+                "slot": None if pct is None else "full" if pct >= 100 else "none" if pct == 0 else "partial",
+            })
+
+    return {
+        "type": code,
+        "typeName": TRAINING_TYPES.get(code),
+        "intensity": intensity if intensity is not None else from_text(r"intensity"),
+        "staminaShare": stamina if stamina is not None else from_text(r"stamina"),
+        "coachLevel": coach_level,
+        "players": players,
+    }
+
+
 # ---------------------------------------------------------------------------
 # Tools
 # ---------------------------------------------------------------------------
 
+# The team's own pages, shared by the hattrick_get_* tools and the hattrick:// resources
+_TEAM_PAGES = {
+    "team": f"/en/Club/?TeamID={TEAM_ID}",
+    "players": f"/en/Club/Players/?TeamID={TEAM_ID}",
+    "matches": f"/en/Club/Matches/?TeamID={TEAM_ID}",
+    "training": "/en/Club/Training/",
+    "economy": "/en/Club/Finances/",
+    "league": f"/en/World/Series/?LeagueLevelUnitID={LEAGUE_ID}",
+}
+_TEAM_PAGE_KEYS = {_canonical(BASE + path): name for name, path in _TEAM_PAGES.items()}
+
+# Team page → parser(extraction) -> dict of structured facts, published with the
+# page's `latest` row so the JS side can use them without reading page text.
+_PAGE_PARSERS = {
+    "players": lambda data: {"players": _parse_players(data)},
+    "matches": _matches_facts,
+    "economy": _parse_finances,
+    "league": _parse_standings,
+    "training": lambda data: {"training": _parse_training(data)},
+}
+
+
+def _page_facts(page: str, data: dict) -> dict:
+    parser = _PAGE_PARSERS.get(page)
+    if not parser:
+        return {}
+    try:
+        return parser(data)
+    except Exception as e:
+        log.warning("%s parser failed: %s", page, e)
+        return {}
+
+
 @mcp.tool()
 async def hattrick_login() -> str:
     """Login to hattrick.org. Returns dashboard info and team ID."""
     if not HATTRICK_USERNAME or not HATTRICK_PASSWORD:
         return json.dumps({"error": "HATTRICK_USERNAME/PASSWORD env vars required"})
 
-    data = await _open_page(f"{BASE}/en/MyHattrick/Dashboard.aspx")
+    data = await _open_page(f"{BASE}/en/MyHattrick/Dashboard.aspx", fields=_fields(tables=0))
     team_id = TEAM_ID
     for link in data.get("links", []):
         m = re.search(r"TeamID=(\d+)", link.get("href", ""))
@@ -228,20 +2164,32 @@ async def hattrick_login() -> str:
 
 
 @mcp.tool()
-async def hattrick_scrape(url: str) -> str:
+async def hattrick_scrape(url: str, force: bool = False, mode: str = "full", since: str = "") -> str:
     """Read any hattrick.org page (auto-login). Returns page text, links, tables.
 
+    Served over plain HTTP with the saved session when possible, falling back to the
+    browser for login redirects and JavaScript-only pages ("served_by" says which).
+
+    Recent reads are answered from a per-page-type cache ("cached", "cache_age");
+    hattrick_action invalidates the pages it touches.
+
+    Every reply carries a "version" (content hash). mode="delta" returns only the
+    text lines and table rows that changed since `since` (default: the previous
+    read), or "unchanged": true.
+
     Args:
         url: Full URL or path like '/en/Club/Players/?TeamID=YOUR_TEAM_ID'
+        force: Skip the cache and read the live page
+        mode: "full" (default) or "delta"
+        since: Version to diff against in delta mode
     """
-    data = await _open_page(url)
-    return json.dumps({
+    data = await _read_page(url, fields=_fields(links=50), force=force)
+    return await _respond(data, {
         "url": data["url"],
         "text": _trunc(data["text"], 5000),
         "links": data["links"][:50],
         "tables": data["tables"],
-        "error": data.get("error"),
-    })
+    }, mode, since)
 
 
 @mcp.tool()
@@ -411,7 +2359,7 @@ async def hattrick_inspect(url: str) -> str:
             return results.filter(r => r.visible);
         }""")
 
-    data = await _open_page(url, page_callback=inspect)
+    data = await _open_page(url, page_callback=inspect, fields=FIELDS_TEXT)
     return json.dumps({
         "url": data["url"],
         "elements": elements,
@@ -456,6 +2404,7 @@ async def hattrick_action(url: str, actions: str) -> str:
         return json.dumps({"error": f"Invalid JSON: {e}"})
 
     results = []
+    mutating = {"click", "select", "check", "uncheck", "press", "drag"}
 
     async def run(page):
         for i, act in enumerate(action_list):
@@ -479,11 +2428,10 @@ async def hattrick_action(url: str, actions: str) -> str:
                     key = act.get("key", "Enter")
                     await page.press(sel, key, timeout=10000)
                 elif t == "goto":
-                    goto_url = act.get("url", "")
-                    if goto_url.startswith("/"):
-                        goto_url = BASE + goto_url
-                    await page.goto(goto_url, wait_until="networkidle", timeout=20000)
-                    await page.wait_for_timeout(2000)
+                    # Stay on the authenticated subdomain whatever host the caller wrote
+                    goto_url = _to_base(act.get("url", ""), _origin(page.url))
+                    await page.goto(goto_url, wait_until="domcontentloaded", timeout=20000)
+                    await _wait_ready(page, goto_url)
                 elif t == "eval":
                     js = act.get("js", "")
                     eval_result = await page.evaluate(js)
@@ -502,9 +2450,28 @@ async def hattrick_action(url: str, actions: str) -> str:
             except Exception as e:
                 results.append({"i": i, "type": t, "error": str(e)[:200]})
 
-        await page.wait_for_timeout(1500)
+        # Let any postback triggered by the last action settle before reading the result.
+        # The DOM from before the action already passes the load-state and readiness
+        # checks, so first wait for the action's own requests to finish (bounded: ad
+        # and analytics polling can keep the network busy).
+        last = next((a.get("type") for a in reversed(action_list) if a.get("type") not in ("wait", "eval")), None)
+        if last in mutating:
+            try:
+                await page.wait_for_load_state("networkidle", timeout=SETTLE_TIMEOUT)
+            except Exception:
+                pass
+        try:
+            await page.wait_for_load_state("domcontentloaded", timeout=10000)
+        except Exception:
+            pass
+        await _wait_ready(page)
+
+    data = await _open_page(url, page_callback=run, fields=FIELDS_TEXT)
+
+    # Anything this action navigated through may have changed — drop it from the cache
+    touched = [url, data["url"]] + [a.get("url", "") for a in action_list if a.get("type") == "goto"]
+    _invalidate({_family(u) for u in touched if u})
 
-    data = await _open_page(url, page_callback=run)
     return json.dumps({
         "url": data["url"],
         "actions": results,
@@ -518,77 +2485,312 @@ async def hattrick_action(url: str, actions: str) -> str:
 # ---------------------------------------------------------------------------
 
 @mcp.tool()
-async def hattrick_get_team() -> str:
-    """Get team overview — name, league, rating, stadium, manager info."""
-    data = await _open_page(f"/en/Club/?TeamID={TEAM_ID}")
-    return json.dumps({
+async def hattrick_get_team(force: bool = False, mode: str = "full", since: str = "") -> str:
+    """Get team overview — name, league, rating, stadium, manager info.
+
+    Args:
+        force: Skip the cache and read the live page
+        mode: "full", or "delta" for only what changed since `since` (see hattrick_scrape)
+        since: Version to diff against in delta mode
+    """
+    data = await _read_page(_TEAM_PAGES["team"], fields=_fields(tables=5), force=force)
+    # No parser for this page: "structured" mode returns the full reply
+    return await _respond(data, {
         "team_id": TEAM_ID,
         "text": _trunc(data["text"]),
         "links": _filter_links(data["links"], "TeamID")[:20],
         "tables": data["tables"][:5],
-        "error": data.get("error"),
-    })
+    }, mode, since)
 
 
 @mcp.tool()
-async def hattrick_get_players() -> str:
-    """Get full player roster — names, ages, skills, TSI, salary, specialty."""
-    data = await _open_page(f"/en/Club/Players/?TeamID={TEAM_ID}")
-    return json.dumps({
+async def hattrick_get_players(force: bool = False, mode: str = "full", since: str = "") -> str:
+    """Get full player roster — names, ages, skills, TSI, salary, specialty.
+
+    "players" holds one parsed record per player (playerID, name, age, specialty, tsi/TSI,
+    wage, form, stamina, keeper, defending, playmaking, winger, passing, scoring,
+    set_pieces — skill words as 0-20 numbers), ready for saveSnapshot. Page text is
+    shortened when parsing succeeded; use hattrick_scrape for the full page.
+
+    Args:
+        force: Skip the cache and read the live page
+        mode: "full", "structured" (players only, no page text), or "delta" for only
+            what changed since `since` (see hattrick_scrape)
+        since: Version to diff against in delta mode
+    """
+    data = await _read_page(_TEAM_PAGES["players"], fields=_fields(links=250), force=force)
+    players = _parse_players(data)
+    parsed = any(p["TSI"] is not None or p["scoring"] is not None for p in players)
+    return await _respond(data, {
         "team_id": TEAM_ID,
-        "text": _trunc(data["text"], 6000),
-        "player_links": _filter_links(data["links"], "playerID")[:30],
+        "players": players,
+        "text": _trunc(data["text"], 1500 if parsed else 6000),
+        "player_links": [] if parsed else _filter_links(data["links"], "playerID")[:30],
         "tables": data["tables"],
-        "error": data.get("error"),
-    })
+    }, mode, since, parsed)
 
 
 @mcp.tool()
-async def hattrick_get_matches() -> str:
-    """Get upcoming and recent match fixtures."""
-    data = await _open_page(f"/en/Club/Matches/?TeamID={TEAM_ID}")
-    return json.dumps({
+async def hattrick_get_matches(force: bool = False, mode: str = "full", since: str = "") -> str:
+    """Get upcoming and recent match fixtures.
+
+    "fixtures" holds one parsed record per match: matchID, type (league/cup/friendly/...),
+    date (ISO, site time) and matchDate (epoch ms), homeTeam/awayTeam with TeamIDs,
+    isHome, opponentTeamID, score, status (finished/upcoming), goalsFor/goalsAgainst/result.
+
+    Args:
+        force: Skip the cache and read the live page
+        mode: "full", "structured" (fixtures only, no page text), or "delta" for only
+            what changed since `since` (see hattrick_scrape)
+        since: Version to diff against in delta mode
+    """
+    data = await _read_page(_TEAM_PAGES["matches"], fields=_fields(tables=5, row_meta=True), force=force)
+    fixtures = _parse_matches(data)
+    return await _respond(data, {
         "team_id": TEAM_ID,
+        "fixtures": fixtures,
         "text": _trunc(data["text"]),
         "match_links": _filter_links(data["links"], "matchID")[:20],
         "tables": data["tables"][:5],
-        "error": data.get("error"),
-    })
+    }, mode, since, bool(fixtures))
 
 
 @mcp.tool()
-async def hattrick_get_training() -> str:
-    """Get current training type, intensity, and player training status."""
-    data = await _open_page("/en/Club/Training/")
-    return json.dumps({
+async def hattrick_get_training(force: bool = False, mode: str = "full", since: str = "") -> str:
+    """Get the current training as a parsed record.
+
+    `training`: type (dropdown code, see TRAINING_TYPES) and typeName, intensity and
+    staminaShare (%), coachLevel (0-20) and players — one slot per player with its
+    training share (%) and slot "full" / "partial" / "none". Unknown values are null.
+
+    Args:
+        force: Skip the cache and read the live page
+        mode: "full", "structured" (training record only, no page text), or "delta" for
+            only what changed since `since` (see hattrick_scrape)
+        since: Version to diff against in delta mode
+    """
+    data = await _read_page(_TEAM_PAGES["training"], fields=_fields(links=0, tables=5, row_meta=True, controls=20),
+                            force=force)
+    training = _parse_training(data)
+    return await _respond(data, {
+        "training": training,
         "text": _trunc(data["text"]),
         "tables": data["tables"][:5],
-        "error": data.get("error"),
-    })
+    }, mode, since, training["type"] is not None or bool(training["players"]))
 
 
 @mcp.tool()
-async def hattrick_get_economy() -> str:
-    """Get club finances — cash, weekly income/expenses, sponsors, arena."""
-    data = await _open_page("/en/Club/Finances/")
-    return json.dumps({
+async def hattrick_get_economy(force: bool = False, mode: str = "full", since: str = "") -> str:
+    """Get club finances — cash, weekly income/expenses, sponsors, arena.
+
+    "finances" is the parsed record: cash, weeklyIncome, weeklyExpenses, weeklyNetProfit,
+    wageTotal and the income / expenses lines (this week's column), as integers in the
+    team's currency.
+
+    Args:
+        force: Skip the cache and read the live page
+        mode: "full", "structured" (finances record only, no page text — unless cash
+            wasn't found, then the full reply), or "delta" for only what changed since
+            `since` (see hattrick_scrape)
+        since: Version to diff against in delta mode
+    """
+    data = await _read_page(_TEAM_PAGES["economy"], fields=_fields(links=0, tables=5), force=force)
+    finances = _parse_finances(data)
+    return await _respond(data, {
+        "finances": finances,
         "text": _trunc(data["text"]),
         "tables": data["tables"][:5],
-        "error": data.get("error"),
-    })
+    }, mode, since, finances["cash"] is not None)
 
 
 @mcp.tool()
-async def hattrick_get_league() -> str:
-    """Get league table for team's current division."""
-    data = await _open_page(f"/en/World/Series/?LeagueLevelUnitID={LEAGUE_ID}")
-    return json.dumps({
+async def hattrick_get_league(force: bool = False, mode: str = "full", since: str = "") -> str:
+    """Get league table for team's current division.
+
+    "standings" is the parsed table (position, teamId, teamName, played, won, drawn, lost,
+    goalsFor, goalsAgainst, goalDiff, points, isOwn); "own" is our row in
+    appendLeagueSnapshot's shape ({position, totalTeams, points, round, goalDiff}).
+
+    Args:
+        force: Skip the cache and read the live page
+        mode: "full", "structured" (standings only, no page text), or "delta" for only
+            what changed since `since` (see hattrick_scrape)
+        since: Version to diff against in delta mode
+    """
+    data = await _read_page(_TEAM_PAGES["league"], fields=_fields(links=0, tables=5, row_meta=True), force=force)
+    league = _parse_standings(data)
+    return await _respond(data, {
         "league_id": LEAGUE_ID,
+        **league,
         "text": _trunc(data["text"]),
         "tables": data["tables"][:5],
-        "error": data.get("error"),
+    }, mode, since, bool(league["standings"]))
+
+
+@mcp.tool()
+async def hattrick_history(url: str, limit: int = 20, version: str = "") -> str:
+    """Scrape history for a page from the local store — no browser involved.
+
+    Without version: list of past scrapes (fetched_at, version hash), newest first.
+    With version: the stored text/links/tables of that version.
+
+    Args:
+        url: Full URL or path of the page (any host/spelling — URLs are canonicalised)
+        limit: Max history entries to list
+        version: A version hash from the list to fetch its full content
+    """
+    key = _canonical(url if not url.startswith("/") else BASE + url)
+    if version:
+        data = await asyncio.to_thread(_pages.payload, key, version)
+        if data is None:
+            return json.dumps({"url": key, "error": f"unknown version {version}"})
+        return json.dumps({"url": key, "version": version, "text": _trunc(data.get("text") or "", 5000),
+                           "links": (data.get("links") or [])[:50], "tables": data.get("tables") or []})
+    history = await asyncio.to_thread(_pages.history, key, max(1, min(limit, 200)))
+    return json.dumps({"url": key, "history": history})
+
+
+@mcp.tool()
+async def hattrick_stats() -> str:
+    """Server diagnostics — browser/tab pool state and request counters (blocked requests etc.)."""
+    return json.dumps({
+        "browser": _browser.pool_stats(),
+        "session": {
+            "age_s": round(_sessions.age()),
+            "expected_lifetime_s": round(lifetime) if (lifetime := _sessions.expected_lifetime()) else None,
+            "validated_ago_s": round(time.time() - _sessions.get().get("validated_at", 0)) if _sessions.get().get("validated_at") else None,
+        },
+        "counters": dict(sorted(_stats.items())),
+        "breakers": {family: b.snapshot() for family, b in sorted(_breakers.items())},
+        "block_policy": {
+            "resource_types": sorted(BLOCK_RESOURCE_TYPES),
+            "routed_extensions": sorted(BLOCK_EXTENSIONS),
+            "hosts": len(BLOCK_HOSTS),
+            "allow_hosts": sorted(ALLOW_HOSTS),
+        },
+    })
+
+
+_REFRESH_READERS = {
+    "team": hattrick_get_team,
+    "players": hattrick_get_players,
+    "matches": hattrick_get_matches,
+    "training": hattrick_get_training,
+    "economy": hattrick_get_economy,
+    "league": hattrick_get_league,
+}
+
+
+@mcp.tool()
+async def hattrick_refresh(pages: str = "team,players,matches,economy,training", force: bool = False,
+                           mode: str = "full") -> str:
+    """Read several team pages at once — they run in parallel tabs, so the whole refresh
+    takes about as long as the slowest page instead of the sum of all of them.
+
+    Args:
+        pages: Comma-separated list from: team, players, matches, training, economy, league
+        force: Skip the cache and read every page live
+        mode: "full", "structured" (parsed records only, for pages whose parser found
+            data — others come back in full), or "delta" for only what changed on each
+            page since its previous read
+    """
+    names = [p.strip().lower() for p in pages.split(",") if p.strip()]
+    unknown = [n for n in names if n not in _REFRESH_READERS]
+    if unknown:
+        return json.dumps({"error": f"unknown pages: {', '.join(unknown)}", "valid": list(_REFRESH_READERS)})
+
+    results = await asyncio.gather(*(_REFRESH_READERS[n](force=force, mode=mode) for n in names))
+    return json.dumps({n: json.loads(r) for n, r in zip(names, results)})
+
+
+# ---------------------------------------------------------------------------
+# Resources
+# ---------------------------------------------------------------------------
+# hattrick://team, players, matches, training, economy, league — the last read of
+# each page straight from the cache / page store, never a scrape. Clients that
+# subscribe get notifications/resources/updated whenever a read (foreground,
+# prefetch or background revalidation) brings in a new version.
+
+_subscribers = {}  # resource URI → set of sessions subscribed to it
+
+
+async def _resource_json(name: str) -> str:
+    key = _canonical(BASE + _TEAM_PAGES[name])
+    entry = _cache.get(key)
+    if entry is None:
+        try:
+            entry = await asyncio.to_thread(_pages.latest, key)
+        except Exception as e:
+            log.warning("page store read failed: %s", e)
+    if entry is None:
+        return json.dumps({"available": False, "hint": f"not read yet — call hattrick_get_{name}"})
+    data = entry["data"]
+    return json.dumps({
+        "available": True,
+        "url": data.get("url"),
+        "fetched_at": round(entry["fetched_at"]),
+        "age_s": round(time.time() - entry["fetched_at"]),
+        "version": entry.get("version"),
+        "text": data.get("text"),
+        "links": data.get("links") or [],
+        "tables": data.get("tables") or [],
     })
 
 
+def _register_resource(name: str, description: str):
+    async def read() -> str:
+        return await _resource_json(name)
+
+    read.__name__ = f"hattrick_{name}_resource"
+    mcp.resource(f"hattrick://{name}", name=f"hattrick-{name}", description=description,
+                 mime_type="application/json")(read)
+
+
+_register_resource("team", "Team overview page as last read (no scrape)")
+_register_resource("players", "Player roster page as last read (no scrape)")
+_register_resource("matches", "Fixtures and results page as last read (no scrape)")
+_register_resource("training", "Training page as last read (no scrape)")
+_register_resource("economy", "Finances page as last read (no scrape)")
+_register_resource("league", "League table as last read (no scrape)")
+
+
+@mcp._mcp_server.subscribe_resource()
+async def _subscribe(uri):
+    _subscribers.setdefault(str(uri), set()).add(mcp._mcp_server.request_context.session)
+
+
+@mcp._mcp_server.unsubscribe_resource()
+async def _unsubscribe(uri):
+    _subscribers.get(str(uri), set()).discard(mcp._mcp_server.request_context.session)
+
+
+# The low-level server advertises resources.subscribe=false even with the handlers
+# above registered — flip it so clients know they can subscribe.
+_get_capabilities = mcp._mcp_server.get_capabilities
+
+
+def _capabilities(*args, **kwargs):
+    caps = _get_capabilities(*args, **kwargs)
+    if getattr(caps, "resources", None) is not None:
+        caps.resources.subscribe = True
+    return caps
+
+
+mcp._mcp_server.get_capabilities = _capabilities
+
+
+async def _notify_updated(key: str):
+    if key not in _TEAM_PAGE_KEYS:
+        return
+    uri = f"hattrick://{_TEAM_PAGE_KEYS[key]}"
+    for session in list(_subscribers.get(uri, ())):
+        try:
+            await session.send_resource_updated(uri)
+            _stats["resource_updates"] += 1
+        except Exception as e:
+            log.debug("dropping subscriber of %s: %s", uri, e)
+            _subscribers[uri].discard(session)
+
+
 if __name__ == "__main__":
     mcp.run(transport="stdio")
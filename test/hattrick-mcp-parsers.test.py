@@ -0,0 +1,188 @@
+"""
+Tests for the page parsers in skills/hattrick-mcp.py — run with: python3 test/hattrick-mcp-parsers.test.py
+
+Fixture-based: small hand-written extractions (the text / links / tables shape
+_extract returns) for the team's pages, fed straight to their parsers.
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(__file__))
+from hattrick_mcp_support import HOST, OWN_TEAM_ID, load_server  # noqa: E402
+
+ht = load_server()
+
+
+class PlayersTest(unittest.TestCase):
+    DATA = {
+        "text": ("Players\n"
+                 "Yoann Mallet\n19 years and 12 days\nTSI: 3 450\nWage: 1 200 NIS/week\nSpecialty: Quick\n"
+                 "Form: solid Stamina: passable\nKeeper: non-existent Defending: weak Playmaking: inadequate\n"
+                 "Winger: poor Passing: passable Scoring: excellent Set pieces: wretched\n"
+                 "Adnan Kassab\n18 years and 40 days\nTSI: 980\nWage: 640 NIS/week\n"
+                 "Form: excellent Stamina: solid Scoring: passable (6)\n"),
+        "links": [{"href": f"{HOST}/Club/Players/Player.aspx?playerId=11&teamId=1000", "text": "Yoann Mallet"},
+                  {"href": f"{HOST}/Club/Players/Player.aspx?playerId=11", "text": "Yoann Mallet"},
+                  {"href": f"{HOST}/Club/Players/Player.aspx?playerId=22", "text": "Adnan Kassab"}],
+    }
+
+    def test_records(self):
+        mallet, kassab = ht._parse_players(self.DATA)
+        self.assertEqual(mallet["playerID"], 11)
+        self.assertEqual((mallet["age"], mallet["tsi"], mallet["TSI"], mallet["wage"]), (19, 3450, 3450, 1200))
+        self.assertEqual(mallet["specialty"], "Quick")
+        self.assertEqual((mallet["form"], mallet["stamina"], mallet["keeper"], mallet["scoring"]), (7, 6, 0, 8))
+        self.assertEqual(mallet["set_pieces"], 2)
+        self.assertEqual((kassab["name"], kassab["tsi"], kassab["specialty"], kassab["scoring"]),
+                         ("Adnan Kassab", 980, None, 6))
+        self.assertIsNone(kassab["keeper"])
+
+    def test_empty_page(self):
+        self.assertEqual(ht._parse_players({"text": "", "links": []}), [])
+
+
+class MatchesTest(unittest.TestCase):
+    DATA = {"tables": [{
+        "rows": [["Date", "Match", "Result"],
+                 ["12.10.2026 20:00", "Us FC - Them United", "2 - 1"],
+                 ["19.10.2026 20:00", "Rivals - Us FC", ""]],
+        "meta": [{"links": [], "icons": []},
+                 {"links": [f"{HOST}/Club/Matches/Match.aspx?matchID=501",
+                            f"{HOST}/Club/?TeamID={OWN_TEAM_ID}", f"{HOST}/Club/?TeamID=2000"],
+                  "icons": ["League match"]},
+                 {"links": [f"{HOST}/Club/Matches/Match.aspx?matchID=502",
+                            f"{HOST}/Club/?TeamID=3000", f"{HOST}/Club/?TeamID={OWN_TEAM_ID}"],
+                  "icons": ["Cup match"]}],
+    }]}
+
+    def test_fixtures(self):
+        played, upcoming = ht._parse_matches(self.DATA)
+        self.assertEqual((played["matchID"], played["type"], played["date"]), (501, "league", "2026-10-12T20:00"))
+        self.assertEqual((played["isHome"], played["opponentTeamID"], played["score"]), (True, 2000, "2-1"))
+        self.assertEqual((played["goalsFor"], played["goalsAgainst"], played["result"]), (2, 1, "W"))
+        self.assertEqual((upcoming["type"], upcoming["status"], upcoming["isHome"]), ("cup", "upcoming", False))
+        self.assertEqual(upcoming["opponentTeamID"], 3000)
+
+    def test_separate_time_cell_is_not_a_score(self):
+        data = {"tables": [{
+            "rows": [["19.10.2099", "20:00", "Rivals - Us FC", ""],
+                     ["26.10.2099", "20:00", "Us FC - Them United", "0 - 0"]],
+            "meta": [{"links": [f"{HOST}/Club/Matches/Match.aspx?matchID=503",
+                                f"{HOST}/Club/?TeamID=3000", f"{HOST}/Club/?TeamID={OWN_TEAM_ID}"]},
+                     {"links": [f"{HOST}/Club/Matches/Match.aspx?matchID=504",
+                                f"{HOST}/Club/?TeamID={OWN_TEAM_ID}", f"{HOST}/Club/?TeamID=2000"]}],
+        }]}
+        for m in ht._parse_matches(data):
+            self.assertEqual((m["status"], m["score"], m["result"]), ("upcoming", None, None), m["matchID"])
+        self.assertEqual(ht._parse_matches(data)[0]["date"], "2099-10-19T20:00")
+
+    def test_facts(self):
+        facts = ht._matches_facts(self.DATA)
+        self.assertEqual(facts["last_match_at"], facts["matches"][0]["matchDate"])
+        self.assertEqual(facts["next_match_at"], facts["matches"][1]["matchDate"])
+
+    def test_date_formats(self):
+        for text in ("2026-10-12 20:00", "12.10.2026 20:00", "12-10-2026 20:00", "10/12/2026 20:00"):
+            self.assertEqual(ht._parse_datetime(text)[0], "2026-10-12T20:00", text)
+        self.assertEqual(ht._parse_datetime("no date"), (None, None))
+
+
+class FinancesTest(unittest.TestCase):
+    def test_money_formats(self):
+        cases = {"1 234 567 NIS": 1234567, "1,234,567 US$": 1234567, "1.234 €": 1234, "−12 300": -12300,
+                 "(500)": -500, "3 100,50 kr": 3100, "CHF 1'250": 1250, "-": None, "": None}
+        for text, want in cases.items():
+            self.assertEqual(ht._parse_money(text), want, text)
+
+    def test_side_by_side_table(self):
+        data = {"text": "Finances\nCash: 3 104 000 NIS\n", "tables": [{"rows": [
+            ["Income", "This week", "Last week", "Expenses", "This week", "Last week"],
+            ["Spectators", "410 000", "395 000", "Wages", "180 500", "180 500"],
+            ["Sponsors", "150 000", "150 000", "Staff", "25 000", "25 000"],
+            ["Total income", "560 000", "545 000", "Total expenses", "205 500", "205 500"],
+        ]}]}
+        f = ht._parse_finances(data)
+        self.assertEqual(f["cash"], 3104000)
+        self.assertEqual((f["weeklyIncome"], f["weeklyExpenses"], f["weeklyNetProfit"]), (560000, 205500, 354500))
+        self.assertEqual(f["wageTotal"], 180500)
+        self.assertEqual(f["income"], {"spectators": 410000, "sponsors": 150000})
+
+    def test_nothing_recognised(self):
+        f = ht._parse_finances({"text": "Maintenance", "tables": []})
+        self.assertIsNone(f["cash"])
+        self.assertIsNone(f["weeklyNetProfit"])
+
+
+class StandingsTest(unittest.TestCase):
+    def team(self, team_id):
+        return {"links": [f"{HOST}/Club/?TeamID={team_id}"], "icons": []}
+
+    def test_table(self):
+        data = {"tables": [{
+            "rows": [["", "Team", "Pl", "W", "D", "L", "Goals", "Diff", "Pts"],
+                     ["1.", "Them United", "10", "8", "1", "1", "25 - 9", "+16", "25"],
+                     ["2.", "Us FC", "10", "7", "2", "1", "20 - 10", "+10", "23"],
+                     ["3.", "Rivals", "10", "1", "0", "9", "6 - 30", "−24", "3"]],
+            "meta": [{"links": [], "icons": []}, self.team(2000), self.team(OWN_TEAM_ID), self.team(3000)],
+        }]}
+        league = ht._parse_standings(data)
+        self.assertEqual([t["teamId"] for t in league["standings"]], [2000, OWN_TEAM_ID, 3000])
+        us = league["standings"][1]
+        self.assertEqual((us["position"], us["played"], us["won"], us["drawn"], us["lost"]), (2, 10, 7, 2, 1))
+        self.assertEqual((us["goalsFor"], us["goalsAgainst"], us["goalDiff"], us["points"]), (20, 10, 10, 23))
+        self.assertTrue(us["isOwn"])
+        self.assertEqual(league["own"], {"position": 2, "totalTeams": 3, "points": 23, "round": 10, "goalDiff": 10})
+
+    def test_no_table(self):
+        self.assertEqual(ht._parse_standings({"tables": []}), {"standings": [], "own": None})
+
+
+class TrainingTest(unittest.TestCase):
+    HTML = """<html><body><h1>Training</h1>
+    <form>
+      <select name="ctl00$ddlTrainingType" id="ddlTraining">
+        <option value="9">Goalkeeping</option><option value="4" selected>Scoring</option>
+      </select>
+      <input type="text" name="ctl00$txtTrainingLevel" id="txtIntensity" value="100">
+      <input type="text" name="ctl00$txtStamina" value="15">
+      <input type="hidden" name="__VIEWSTATE" value="abc">
+    </form>
+    <p>Coach: Anna Kovacs (solid)</p>
+    <table>
+      <tr><th>Player</th><th>Training</th></tr>
+      <tr><td><a href="/Club/Players/Player.aspx?PlayerID=11">Yoann Mallet</a></td><td>100%</td></tr>
+      <tr><td><a href="/Club/Players/Player.aspx?PlayerID=22">Adnan Kassab</a></td><td><img title="Partial training"></td></tr>
+      <tr><td><a href="/Club/Players/Player.aspx?PlayerID=33">Reserve Keeper</a></td><td>0 %</td></tr>
+    </table>
+    </body></html>"""
+
+    def extract(self):
+        parser = ht._HTMLExtractor(f"{HOST}/en/Club/Training/",
+                                   ht._fields(links=0, tables=5, row_meta=True, controls=20))
+        parser.feed(self.HTML)
+        parser.close()
+        return parser.result()
+
+    def test_controls(self):
+        controls = self.extract()["controls"]
+        self.assertEqual([c["value"] for c in controls], ["4", "100", "15"])
+        self.assertEqual(controls[0]["label"], "Scoring")
+
+    def test_record(self):
+        t = ht._parse_training(self.extract())
+        self.assertEqual((t["type"], t["typeName"], t["intensity"], t["staminaShare"]), (4, "Scoring", 100, 15))
+        self.assertEqual(t["coachLevel"], 7)
+        self.assertEqual([(p["playerID"], p["share"], p["slot"]) for p in t["players"]],
+                         [(11, 100, "full"), (22, 50, "partial"), (33, 0, "none")])
+
+    def test_text_fallback(self):
+        t = ht._parse_training({"text": "Training type: Set pieces\nTraining intensity: 95%\n"
+                                        "Stamina training share: 20 %\nTrainer: Joe Bloggs (excellent)"})
+        self.assertEqual((t["type"], t["intensity"], t["staminaShare"], t["coachLevel"]), (2, 95, 20, 8))
+        self.assertEqual(t["players"], [])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,497 @@
+"""
+Tests for the caching, session and browser plumbing in skills/hattrick-mcp.py — run with:
+python3 test/hattrick-mcp-server.test.py
+
+Nothing here touches the network or a real browser: the fetch layer and the
+browser launch are replaced per test, and the session/page stores live under
+a throwaway HOME.
+"""
+
+import asyncio
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+from contextlib import asynccontextmanager
+
+sys.path.insert(0, os.path.dirname(__file__))
+from hattrick_mcp_support import HOST, load_server  # noqa: E402
+
+ht = load_server()
+
+
+class CanonicalTest(unittest.TestCase):
+    def test_host_locale_case_and_query_order(self):
+        want = "/en/club/players/?teamid=1000"
+        for url in (f"{HOST}/en/Club/Players/?TeamID=1000",
+                    "https://www.hattrick.org/Club/Players?teamId=1000",
+                    "/EN/Club/Players/Default.aspx?TeamID=1000#top",
+                    f"{HOST}/en/Club/Players/?TeamID=1000&x="):
+            self.assertEqual(ht._canonical(url), want, url)
+
+    def test_sorted_query_and_aspx_kept(self):
+        self.assertEqual(ht._canonical(f"{HOST}/en/Club/Matches/Match.aspx?matchID=5&SourceSystem=Hattrick"),
+                         "/en/club/matches/match.aspx?matchid=5&sourcesystem=Hattrick")
+
+    def test_other_sites_unchanged(self):
+        self.assertEqual(ht._canonical("https://example.com/A?B=1"), "https://example.com/A?B=1")
+
+
+class ContentHashTest(unittest.TestCase):
+    def test_same_content_from_another_host_and_extractor(self):
+        http = {"text": "Cash:\t1 000\nTeam", "links": [{"href": f"{HOST}/en/Club/?TeamID=1000", "text": "Us"}],
+                "tables": [{"rows": [["a ", "b"]]}]}
+        browser = {"text": "Cash: 1 000 Team", "links": [{"href": "https://www12.hattrick.org/Club/?teamid=1000",
+                                                          "text": " Us"}],
+                   "tables": [{"rows": [["a", "b"]]}]}
+        self.assertEqual(ht._content_hash(http), ht._content_hash(browser))
+        self.assertNotEqual(ht._content_hash(http), ht._content_hash({**browser, "text": "Cash: 2 000 Team"}))
+
+
+class DiffTablesTest(unittest.TestCase):
+    def test_rows_of_the_table_shape(self):
+        old = [{"rows": [["1", "Us", "10"], ["2", "Them", "9"]]}]
+        new = [{"rows": [["1", "Us", "13"], ["2", "Them", "9"]], "meta": [{}, {}]}]
+        self.assertEqual(ht._diff_tables(old, new),
+                         [{"table": 0, "added": [["1", "Us", "13"]], "removed": [["1", "Us", "10"]]}])
+        self.assertEqual(ht._diff_tables(old, old), [])
+
+
+
+
+class _ReadTest(unittest.TestCase):
+    """_read_page against a stubbed _fetch_page and an empty page store."""
+
+    PAGE = f"{HOST}/en/Club/Players/?TeamID=2000"
+
+    def setUp(self):
+        for state in (ht._cache, ht._inflight, ht._invalidated_at, ht._breakers):
+            state.clear()
+        ht._stats.clear()
+        self.fetches = []
+        self.gate = None  # an asyncio.Event the stub waits on before answering
+        self.text = "Players page"
+        self.error = None
+        self.nav_s = 0.5
+        store_dir = tempfile.mkdtemp(prefix="ht-pages-")
+        saved = ht._fetch_page, ht._pages
+        ht._fetch_page = self.fake_fetch
+        ht._pages = ht._PageStore(os.path.join(store_dir, "pages.db"))
+        self.addCleanup(shutil.rmtree, store_dir, True)
+        self.addCleanup(setattr, ht, "_pages", saved[1])
+        self.addCleanup(setattr, ht, "_fetch_page", saved[0])
+
+    async def fake_fetch(self, target_url, fields):
+        self.fetches.append(target_url)
+        if self.gate:
+            await self.gate.wait()
+        return {"url": target_url, "text": "" if self.error else self.text, "links": [], "tables": [],
+                "error": self.error, "served_by": "http", "nav_s": self.nav_s}
+
+    def read(self, url=None, **kwargs):
+        return asyncio.run(ht._read_page(url or self.PAGE, **kwargs))
+
+
+class CacheTest(_ReadTest):
+    def test_miss_then_hit(self):
+        first, second = self.read(), self.read()
+        self.assertEqual((first["cached"], second["cached"]), (False, True))
+        self.assertEqual(second["text"], "Players page")
+        self.assertEqual(second["cache_key"], "/en/club/players/?teamid=2000")
+        self.assertEqual(len(self.fetches), 1)
+        self.assertEqual((ht._stats["cache_misses"], ht._stats["cache_hits"]), (1, 1))
+
+    def test_same_page_under_another_url_hits(self):
+        self.read()
+        self.assertTrue(self.read("https://www12.hattrick.org/Club/Players/?teamId=2000")["cached"])
+        self.assertEqual(len(self.fetches), 1)
+
+    def test_expired_forced_and_invalidated_entries_refetch(self):
+        self.read()
+        ht._cache["/en/club/players/?teamid=2000"]["fetched_at"] -= ht._ttl("players") + 1
+        self.assertFalse(self.read()["cached"])
+        self.assertFalse(self.read(force=True)["cached"])
+        ht._invalidate({"players"})
+        self.assertNotIn("/en/club/players/?teamid=2000", ht._cache)
+        self.assertFalse(self.read()["cached"])
+        self.assertEqual(len(self.fetches), 4)
+
+    def test_narrower_extraction_does_not_serve_a_wider_read(self):
+        self.read(fields=ht.FIELDS_TEXT)
+        self.assertTrue(self.read(fields=ht.FIELDS_TEXT)["cached"])
+        self.assertFalse(self.read()["cached"])
+        self.assertEqual(len(self.fetches), 2)
+
+    def test_failed_reads_are_not_cached(self):
+        self.error = "Timeout 30000ms exceeded"
+        self.read()
+        self.error = None
+        self.assertFalse(self.read()["cached"])
+        self.assertEqual(len(self.fetches), 2)
+
+
+class CoalescingTest(_ReadTest):
+    def test_concurrent_misses_share_one_fetch(self):
+        async def two_readers():
+            self.gate = asyncio.Event()
+            readers = [asyncio.ensure_future(ht._read_page(url)) for url in
+                       (self.PAGE, "https://www.hattrick.org/Club/Players/?teamId=2000")]
+            for _ in range(100):  # until the second reader has joined (or clearly won't)
+                if ht._stats["coalesced"] or len(self.fetches) > 1:
+                    break
+                await asyncio.sleep(0.01)
+            self.gate.set()
+            return await asyncio.gather(*readers)
+
+        first, second = asyncio.run(two_readers())
+        self.assertEqual(len(self.fetches), 1)
+        self.assertEqual(first["text"], second["text"])
+        self.assertEqual(ht._stats["coalesced"], 1)
+        self.assertEqual(ht._inflight, {})
+
+
+class PageStoreReuseTest(_ReadTest):
+    def drop_memory_cache(self):
+        ht._cache.clear()
+
+    def test_stored_read_serves_an_empty_memory_cache(self):
+        self.read()
+        self.drop_memory_cache()
+        hit = self.read()
+        self.assertEqual((hit["cached"], hit["text"]), (True, "Players page"))
+        self.assertEqual(len(self.fetches), 1)
+
+    def test_rows_read_before_an_action_are_not_reused(self):
+        self.read()
+        ht._invalidate({"players"})
+        self.drop_memory_cache()
+        self.assertFalse(self.read()["cached"])
+        self.assertEqual(len(self.fetches), 2)
+        self.drop_memory_cache()
+        self.assertTrue(self.read()["cached"])  # the re-read after the action is fine
+
+    def test_other_families_keep_their_rows(self):
+        self.read()
+        ht._invalidate({"training"})
+        self.drop_memory_cache()
+        self.assertTrue(self.read()["cached"])
+
+
+class StaleWhileRevalidateTest(_ReadTest):
+    PAGE = f"{HOST}/en/World/Series/?LeagueLevelUnitID=5"
+    KEY = "/en/world/series/?leaguelevelunitid=5"
+
+    def age_entry(self, seconds):
+        ht._cache[self.KEY]["fetched_at"] -= seconds
+
+    def test_stale_read_is_served_while_refreshing(self):
+        self.text = "Series page"
+        self.read()
+        self.age_entry(ht._ttl("league") + 60)
+        self.text = "Series page, next round"
+
+        async def stale_read():
+            stale = await ht._read_page(self.PAGE)
+            await asyncio.shield(ht._inflight[self.KEY][0])
+            return stale
+
+        stale = asyncio.run(stale_read())
+        self.assertEqual((stale["cached"], stale["revalidating"], stale["text"]), (True, True, "Series page"))
+        self.assertEqual(ht._cache[self.KEY]["data"]["text"], "Series page, next round")
+        self.assertEqual(len(self.fetches), 2)
+        self.assertEqual(ht._stats["stale_served"], 1)
+
+    def test_too_stale_blocks_on_the_fetch(self):
+        self.read()
+        self.age_entry(ht._ttl("league") + ht._STALE_OK["league"] + 1)
+        fresh = self.read()
+        self.assertEqual((fresh["cached"], fresh["revalidating"]), (False, False))
+        self.assertEqual(len(self.fetches), 2)
+
+    def test_families_without_stale_window_block(self):
+        self.read(_ReadTest.PAGE)
+        ht._cache["/en/club/players/?teamid=2000"]["fetched_at"] -= ht._ttl("players") + 1
+        self.assertFalse(self.read(_ReadTest.PAGE)["cached"])
+        self.assertEqual(ht._stats["stale_served"], 0)
+
+
+class BreakerTest(_ReadTest):
+    def test_open_half_open_single_probe(self):
+        self.error = "Timeout 30000ms exceeded"
+        for _ in range(ht.BREAKER_MIN_CALLS):
+            self.assertEqual(self.read()["error"], self.error)
+        breaker = ht._breaker("players")
+        self.assertEqual(breaker.state, "open")
+
+        down = self.read()
+        self.assertTrue(down["site_down"])
+        self.assertEqual(len(self.fetches), ht.BREAKER_MIN_CALLS)  # failed fast, no fetch
+
+        breaker.opened_at -= ht.BREAKER_COOLDOWN_S + 1
+        self.assertEqual(breaker.state, "half_open")
+        self.error = None
+
+        async def probe_and_second_caller():
+            self.gate = asyncio.Event()
+            probe = asyncio.ensure_future(ht._read_page(self.PAGE))
+            while not breaker.probing:
+                await asyncio.sleep(0.01)
+            second = await ht._read_page(f"{HOST}/en/Club/Players/?TeamID=3000")
+            self.gate.set()
+            return await probe, second
+
+        probe, second = asyncio.run(probe_and_second_caller())
+        self.assertTrue(second["site_down"])  # only the probe may go out
+        self.assertEqual((probe["error"], probe["text"]), (None, "Players page"))
+        self.assertEqual(len(self.fetches), ht.BREAKER_MIN_CALLS + 1)
+        self.assertEqual(breaker.state, "closed")
+
+    def test_slow_check_uses_navigation_time(self):
+        self.nav_s = ht.BREAKER_SLOW_S + 1
+        self.read()
+        self.assertFalse(ht._breaker("players").outcomes[-1][0])
+        self.nav_s = 2.0
+        self.read(force=True)
+        self.assertEqual(ht._breaker("players").outcomes[-1], (True, 2.0))
+
+
+class RouteMatcherTest(unittest.TestCase):
+    def test_only_blockable_urls_are_routed(self):
+        routed = ["https://www.google-analytics.com/collect?v=1", "https://stats.g.doubleclick.net/x.js",
+                  f"{HOST}/Img/Icons/star.PNG", f"{HOST}/fonts/site.woff2?v=3"]
+        unrouted = [f"{HOST}/en/Club/Players/?TeamID=1000", f"{HOST}/css/site.css?v=3",
+                    f"{HOST}/js/app.min.js", f"{HOST}/Img/"]
+        for url in routed:
+            self.assertTrue(ht._may_block(url), url)
+        for url in unrouted:
+            self.assertFalse(ht._may_block(url), url)
+
+
+class SessionStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp(prefix="ht-session-")
+        self.addCleanup(shutil.rmtree, self.dir, True)
+        self.path = os.path.join(self.dir, "session.json")
+        self.store = ht._SessionStore(self.path)
+
+    def on_disk(self):
+        with open(self.path) as f:
+            return json.load(f)
+
+    def test_atomic_write_leaves_no_temp_files(self):
+        self.store.update(cookies=[{"name": "a", "value": "1"}], auth_base=HOST)
+        self.assertEqual(self.on_disk()["auth_base"], HOST)
+        with self.assertLogs(ht.log, "WARNING"):
+            self.store.update(broken=object())  # not JSON — the old file must survive
+        self.assertEqual(self.on_disk(), {"cookies": [{"name": "a", "value": "1"}], "auth_base": HOST})
+        self.assertEqual(os.listdir(self.dir), ["session.json"])
+
+    def test_write_behind_inside_the_event_loop(self):
+        async def login():
+            self.store.save_login([{"name": "a", "value": "2"}], HOST, "UA")
+            in_memory = self.store.get()["logged_in_at"]
+            self.assertFalse(os.path.exists(self.path))  # not written on the caller's turn
+            await self.store._flush_task
+            return in_memory
+
+        logged_in_at = asyncio.run(login())
+        self.assertEqual(self.on_disk()["logged_in_at"], logged_in_at)
+
+    def test_reload_when_the_file_changes(self):
+        self.store.update(auth_base=HOST)
+        self.assertEqual(self.store.get()["auth_base"], HOST)
+        with open(self.path, "w") as f:
+            json.dump({"auth_base": "https://www12.hattrick.org"}, f)
+        os.utime(self.path, ns=(1, 1))  # another process's write, with a different mtime
+        self.assertEqual(self.store.get()["auth_base"], "https://www12.hattrick.org")
+        os.remove(self.path)
+        self.assertEqual(self.store.get(), {})
+
+
+class _LoginLocator:
+    def __init__(self, page, selector):
+        self.page, self.selector = page, selector
+        self.first = self
+
+    async def count(self):
+        return 0 if self.page.context.session else 1  # the form only shows when logged out
+
+    async def is_visible(self):
+        return True
+
+    async def click(self):
+        if self.selector.startswith("button"):
+            self.page.context.session = "new"
+            self.page.url = f"{HOST}/en/MyHattrick/Dashboard.aspx"
+
+
+class _LoginContext:
+    def __init__(self, session):
+        self.session = session
+
+    async def cookies(self):
+        return [{"name": "session", "value": self.session}] if self.session else []
+
+    async def add_cookies(self, cookies):
+        self.session = cookies[0]["value"]
+
+    async def clear_cookies(self):
+        self.session = None
+
+
+class _LoginPage:
+    def __init__(self, context):
+        self.context = context
+        self.url = "about:blank"
+
+    async def goto(self, url, **kwargs):
+        self.url = url
+
+    async def wait_for_selector(self, *args, **kwargs):
+        pass
+
+    async def wait_for_url(self, *args, **kwargs):
+        pass
+
+    async def fill(self, *args):
+        pass
+
+    async def evaluate(self, script):
+        return "UA"
+
+    def locator(self, selector):
+        return _LoginLocator(self, selector)
+
+
+class KeepaliveTest(unittest.TestCase):
+    LIFETIME = 3600
+
+    def setUp(self):
+        store_dir = tempfile.mkdtemp(prefix="ht-session-")
+        self.addCleanup(shutil.rmtree, store_dir, True)
+        self.sessions = ht._SessionStore(os.path.join(store_dir, "session.json"))
+        self.logged_in_at = time.time() - self.LIFETIME * 0.9
+        self.sessions.update(cookies=[{"name": "session", "value": "old"}], auth_base=HOST,
+                             logged_in_at=self.logged_in_at, validated_at=time.time() - 60,
+                             lifetimes=[self.LIFETIME])
+        self.page = _LoginPage(_LoginContext("old"))  # the browser is still authenticated
+
+        @asynccontextmanager
+        async def tab():
+            yield self.page
+
+        async def probe():
+            return True
+
+        for name, value in (("_sessions", self.sessions), ("_probe_session", probe),
+                            ("HATTRICK_USERNAME", "user"), ("HATTRICK_PASSWORD", "secret")):
+            self.addCleanup(setattr, ht, name, getattr(ht, name))
+            setattr(ht, name, value)
+        self.addCleanup(setattr, ht._browser, "tab", ht._browser.tab)
+        ht._browser.tab = tab
+        ht._stats.clear()
+
+    def test_near_expiry_submits_a_real_login(self):
+        asyncio.run(ht._keepalive_tick())
+        self.assertEqual(ht._stats["logins"], 1)
+        self.assertGreater(self.sessions.get()["logged_in_at"], self.logged_in_at)
+        self.assertEqual(self.sessions.get()["cookies"], [{"name": "session", "value": "new"}])
+        self.assertLess(self.sessions.age(), 60)
+
+    def test_fresh_session_is_left_alone(self):
+        self.sessions.update(logged_in_at=time.time() - 60, validated_at=time.time())
+        asyncio.run(ht._keepalive_tick())
+        self.assertEqual((ht._stats["logins"], ht._stats["keepalive_refreshes"]), (0, 0))
+
+
+class _FakeDriver:
+    def __init__(self):
+        self.stopped = False
+
+    async def stop(self):
+        self.stopped = True
+
+
+class _FakePage:
+    def __init__(self):
+        self.closed = False
+
+    def is_closed(self):
+        return self.closed
+
+    async def close(self):
+        self.closed = True
+
+
+class _FakeContext:
+    def __init__(self):
+        self.closed = False
+        self.pages = []
+
+    async def new_page(self):
+        if self.closed:
+            raise RuntimeError("Target page, context or browser has been closed")
+        return _FakePage()
+
+    async def close(self):
+        self.closed = True
+
+
+class BrowserRecycleTest(unittest.TestCase):
+    def browser(self):
+        browser = ht._Browser(max_tabs=4)
+
+        async def launch():
+            browser._playwright, browser._context = _FakeDriver(), _FakeContext()
+            browser.launches += 1
+        browser._launch = launch
+        return browser
+
+    def test_stale_failure_keeps_the_relaunched_browser(self):
+        browser = self.browser()
+
+        async def fail_after(ready, relaunched):
+            with self.assertRaises(RuntimeError):
+                async with browser.tab():
+                    ready.set()
+                    await relaunched.wait()
+                    raise RuntimeError("Target closed")
+
+        async def scenario():
+            ready, relaunched = asyncio.Event(), asyncio.Event()
+            slow = asyncio.create_task(fail_after(ready, relaunched))
+            await ready.wait()
+            # A second caller on the same launch fails first and recovers
+            with self.assertRaises(RuntimeError):
+                async with browser.tab():
+                    raise RuntimeError("Target closed")
+            async with browser.tab():
+                pass
+            self.assertEqual(browser.launches, 2)
+            fresh = browser._context
+            relaunched.set()
+            await slow
+            self.assertIs(browser._context, fresh)
+            self.assertFalse(fresh.closed)
+
+        asyncio.run(scenario())
+
+    def test_relaunch_after_close_event_stops_the_old_driver(self):
+        browser = self.browser()
+
+        async def scenario():
+            await browser.context()
+            old_driver = browser._playwright
+            browser._forget()
+            await browser.context()
+            self.assertTrue(old_driver.stopped)
+            self.assertEqual(browser.launches, 2)
+
+        asyncio.run(scenario())
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
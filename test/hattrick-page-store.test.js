@@ -0,0 +1,171 @@
+/**
+ * Tests for modules/hattrick/page-store.js and the helpers built on it — run with:
+ * node test/hattrick-page-store.test.js
+ *
+ * Writes `latest` rows the way skills/hattrick-mcp.py does into a temporary
+ * pages.db (PROJECT_ROOT points at a temp dir, so data/ and state files are
+ * throwaway) and reads them back through getLatestPage / getPageFact,
+ * syncLeagueSnapshotFromStore and getLastKnownEconomy.
+ */
+
+import { fileURLToPath, pathToFileURL } from 'url';
+import { dirname, join } from 'path';
+import { mkdtempSync, mkdirSync, rmSync, existsSync } from 'fs';
+import { tmpdir } from 'os';
+import { createRequire } from 'module';
+
+const __filename = fileURLToPath(import.meta.url);
+const __dirname = dirname(__filename);
+const require = createRequire(import.meta.url);
+const Database = require('better-sqlite3');
+
+// Must be set before lib/config.js is first imported
+const root = mkdtempSync(join(tmpdir(), 'ht-page-store-test-'));
+process.env.PROJECT_ROOT = root;
+const storeDir = join(root, 'data', 'hattrick-browser');
+
+const { getLatestPage, getPageFact } = await import(
+  pathToFileURL(join(__dirname, '..', 'modules', 'hattrick', 'page-store.js')).href);
+const { syncLeagueSnapshotFromStore, loadLeagueHistory, getLastKnownEconomy } = await import(
+  pathToFileURL(join(__dirname, '..', 'modules', 'hattrick', 'hattrick.js')).href);
+
+let passed = 0, failed = 0, total = 0;
+
+function test(name, fn) {
+  total++;
+  try { fn(); passed++; console.log(`  PASS  ${name}`); }
+  catch (err) { failed++; console.log(`  FAIL  ${name}`); console.log(`        ${err.message}`); }
+}
+
+function expect(actual) {
+  return {
+    toBe(expected) { if (actual !== expected) throw new Error(`Expected ${JSON.stringify(expected)}, got ${JSON.stringify(actual)}`); },
+    toEqual(expected) { if (JSON.stringify(actual) !== JSON.stringify(expected)) throw new Error(`Expected ${JSON.stringify(expected)}, got ${JSON.stringify(actual)}`); },
+    toBeNull() { if (actual !== null) throw new Error(`Expected null, got ${JSON.stringify(actual)}`); },
+  };
+}
+
+// Same table and upsert as _PageStore in skills/hattrick-mcp.py: changed_at only
+// moves when the version does
+let db = null;
+function publish(page, version, fetchedAt, facts) {
+  if (!db) {
+    mkdirSync(storeDir, { recursive: true });
+    db = new Database(join(storeDir, 'pages.db'));
+    db.pragma('journal_mode = WAL');
+    db.exec(`CREATE TABLE IF NOT EXISTS latest (
+      page TEXT PRIMARY KEY, url TEXT NOT NULL, fetched_at REAL NOT NULL,
+      version TEXT NOT NULL, changed_at REAL NOT NULL, facts TEXT NOT NULL DEFAULT '{}')`);
+  }
+  db.prepare('INSERT INTO latest (page, url, fetched_at, version, changed_at, facts) VALUES (?, ?, ?, ?, ?, ?) '
+    + 'ON CONFLICT(page) DO UPDATE SET url = excluded.url, fetched_at = excluded.fetched_at, '
+    + 'changed_at = CASE WHEN latest.version = excluded.version THEN latest.changed_at '
+    + 'ELSE excluded.fetched_at END, version = excluded.version, facts = excluded.facts')
+    .run(page, `/en/${page}/`, fetchedAt / 1000, version, fetchedAt / 1000, JSON.stringify(facts));
+}
+
+const now = Date.now();
+
+// ---------------------------------------------------------------------------
+// Before the MCP server has created the store
+// ---------------------------------------------------------------------------
+console.log('\n=== no store yet ===');
+
+test('reads return empty values', () => {
+  expect(getLatestPage('players')).toBeNull();
+  expect(getPageFact('matches', 'next_match_at')).toBeNull();
+  expect(syncLeagueSnapshotFromStore()).toBe(false);
+});
+
+// ---------------------------------------------------------------------------
+// getLatestPage / getPageFact
+// ---------------------------------------------------------------------------
+console.log('\n=== page reads ===');
+
+publish('matches', 'v1', now - 60_000, { matches: [{ matchID: 1 }], last_match_at: now - 86_400_000, next_match_at: now + 3_600_000 });
+
+test('store is picked up once it exists', () => {
+  const page = getLatestPage('matches');
+  expect(page.version).toBe('v1');
+  expect(page.url).toBe('/en/matches/');
+  expect(page.fetchedAt).toBe(now - 60_000);
+  expect(page.facts.matches[0].matchID).toBe(1);
+});
+
+test('re-reading the same version keeps changedAt', () => {
+  publish('team', 't1', now - 60_000, {});
+  publish('team', 't1', now - 30_000, {});
+  expect(getLatestPage('team').fetchedAt).toBe(now - 30_000);
+  expect(getLatestPage('team').changedAt).toBe(now - 60_000);
+  publish('team', 't2', now - 10_000, {});
+  expect(getLatestPage('team').changedAt).toBe(now - 10_000);
+});
+
+test('getPageFact extracts one top-level fact', () => {
+  expect(getPageFact('matches', 'next_match_at')).toBe(now + 3_600_000);
+  expect(getPageFact('matches', 'unknown')).toBeNull();
+  expect(getPageFact('league', 'own')).toBeNull();
+});
+
+// ---------------------------------------------------------------------------
+// syncLeagueSnapshotFromStore
+// ---------------------------------------------------------------------------
+console.log('\n=== syncLeagueSnapshotFromStore ===');
+
+const own = { position: 2, totalTeams: 8, points: 23, round: 10, goalDiff: 10 };
+
+test('no own row → nothing appended', () => {
+  publish('league', 'l0', now, { standings: [], own: null });
+  expect(syncLeagueSnapshotFromStore()).toBe(false);
+  expect(loadLeagueHistory().length).toBe(0);
+});
+
+test('new table version appends the own row', () => {
+  publish('league', 'l1', now, { standings: [], own });
+  expect(syncLeagueSnapshotFromStore()).toBe(true);
+  const history = loadLeagueHistory();
+  expect(history.length).toBe(1);
+  expect({ ...history[0], ts: undefined }).toEqual({ ...own, ts: undefined });
+});
+
+test('same version is not appended twice', () => {
+  publish('league', 'l1', now + 1000, { standings: [], own });
+  expect(syncLeagueSnapshotFromStore()).toBe(false);
+  expect(loadLeagueHistory().length).toBe(1);
+});
+
+test('new version with the same own row is not appended', () => {
+  publish('league', 'l2', now + 2000, { standings: [{ teamId: 2000, points: 28 }], own });
+  expect(syncLeagueSnapshotFromStore()).toBe(false);
+  expect(loadLeagueHistory().length).toBe(1);
+});
+
+test('later change appends again', () => {
+  publish('league', 'l3', now + 60_000, { standings: [], own: { ...own, points: 26, round: 11 } });
+  expect(syncLeagueSnapshotFromStore()).toBe(true);
+  const history = loadLeagueHistory();
+  expect(history.length).toBe(2);
+  expect(history[1].points).toBe(26);
+});
+
+// ---------------------------------------------------------------------------
+// getLastKnownEconomy
+// ---------------------------------------------------------------------------
+console.log('\n=== getLastKnownEconomy ===');
+
+test('parsed finances come with their fetch time', () => {
+  publish('economy', 'e1', now - 5000, { cash: 3_104_000, weeklyNetProfit: 354_500, wageTotal: 180_500 });
+  const economy = getLastKnownEconomy();
+  expect(economy.cash).toBe(3_104_000);
+  expect(economy.weeklyNetProfit).toBe(354_500);
+  expect(economy.fetchedAt).toBe(now - 5000);
+});
+
+// ---------------------------------------------------------------------------
+// Cleanup
+// ---------------------------------------------------------------------------
+try { db?.close(); } catch {}
+if (existsSync(root)) rmSync(root, { recursive: true, force: true });
+
+console.log(`\n--- ${total} tests: ${passed} passed, ${failed} failed ---`);
+process.exit(failed > 0 ? 1 : 0);
@@ -0,0 +1,80 @@
+"""
+Loads skills/hattrick-mcp.py for the *.test.py suites (not a test file itself).
+
+The server writes under ~/sela/data and reads its team from the environment, so
+HOME is pointed at a throwaway directory first. The suites call the server's
+helpers directly and never speak MCP; when mcp < 2 isn't installed, a minimal
+FastMCP stand-in takes its place so the tests still run instead of skipping.
+"""
+
+import atexit
+import importlib.util
+import os
+import shutil
+import sys
+import tempfile
+import types
+
+OWN_TEAM_ID = 1000
+HOST = "https://www84.hattrick.org"
+
+
+class _LowLevelServer:
+    def __init__(self):
+        self.handlers = {}
+
+    def subscribe_resource(self):
+        return lambda fn: self.handlers.setdefault("subscribe", fn)
+
+    def unsubscribe_resource(self):
+        return lambda fn: self.handlers.setdefault("unsubscribe", fn)
+
+    def get_capabilities(self, *args, **kwargs):
+        return None
+
+
+class _FastMCP:
+    """Just enough of mcp.server.fastmcp.FastMCP for the module to import."""
+
+    def __init__(self, name, **settings):
+        self.name = name
+        self.settings = settings
+        self.resources = {}
+        self._mcp_server = _LowLevelServer()
+
+    def tool(self, *args, **kwargs):
+        return lambda fn: fn
+
+    def resource(self, uri, **kwargs):
+        def register(fn):
+            self.resources[uri] = fn
+            return fn
+        return register
+
+    def run(self, **kwargs):
+        raise RuntimeError("stand-in FastMCP cannot serve")
+
+
+def _install_fastmcp_stand_in():
+    for name in ("mcp", "mcp.server"):
+        sys.modules.setdefault(name, types.ModuleType(name))
+    fastmcp = types.ModuleType("mcp.server.fastmcp")
+    fastmcp.FastMCP = _FastMCP
+    sys.modules["mcp.server.fastmcp"] = fastmcp
+
+
+def load_server():
+    try:
+        import mcp.server.fastmcp  # noqa: F401
+    except ImportError:
+        print("  note: mcp < 2 not installed, using a FastMCP stand-in")
+        _install_fastmcp_stand_in()
+    home = tempfile.mkdtemp(prefix="ht-mcp-test-")
+    atexit.register(shutil.rmtree, home, True)
+    os.environ["HOME"] = home
+    os.environ["HATTRICK_TEAM_ID"] = str(OWN_TEAM_ID)
+    spec = importlib.util.spec_from_file_location(
+        "hattrick_mcp", os.path.join(os.path.dirname(__file__), "..", "skills", "hattrick-mcp.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
@@ -1,6 +1,7 @@
 /**
  * Run all test files — node test/run-all.js
  * Spawns each test file in a subprocess and reports results.
+ * *.test.py files (the Python MCP servers' tests) run with $PYTHON, default python3.
  */
 
 import { execSync } from 'child_process';
@@ -12,7 +13,7 @@ const __filename = fileURLToPath(import.meta.url);
 const __dirname = dirname(__filename);
 
 const testFiles = readdirSync(__dirname)
-  .filter(f => f.endsWith('.test.js'))
+  .filter(f => f.endsWith('.test.js') || f.endsWith('.test.py'))
   .sort();
 
 console.log(`\nRunning ${testFiles.length} test suites...\n`);
@@ -26,7 +27,8 @@ for (const file of testFiles) {
   console.log('='.repeat(60));
 
   try {
-    const output = execSync(`node "${filePath}"`, {
+    const runner = file.endsWith('.py') ? (process.env.PYTHON || 'python3') : 'node';
+    const output = execSync(`${runner} "${filePath}"`, {
       encoding: 'utf-8',
       timeout: 30_000,
       cwd: join(__dirname, '..'),
@@ -38,7 +40,7 @@ for (const file of testFiles) {
     console.log(err.stdout || '');
     // Only show stderr lines that look like test output (PASS/FAIL/---), skip log noise
     const stderr = (err.stderr || '').split('\n')
-      .filter(l => /PASS|FAIL|tests:|===|---/.test(l))
+      .filter(l => /PASS|FAIL|tests:|===|---|\.\.\. (?:ok|FAIL|ERROR)|^Ran \d+/.test(l))
       .join('\n');
     if (stderr) console.log(stderr);
     console.log(`  *** SUITE FAILED ***\n`);